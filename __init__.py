@@ -7,15 +7,33 @@ It provides a CLI and importable API for loading and executing
 Claude Code components in OpenCode.
 """
 
-import argparse
-import json
 import sys
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Optional, List
 
-from .loader import BridgeLoader, BridgeRegistry
-from .commands import CommandExecutor
-from .hooks import HookEngine, HookType
+if TYPE_CHECKING:
+    from .loader import BridgeLoader, BridgeRegistry
+    from .commands import CommandExecutor
+    from .hooks import HookEngine
+
+# Submodule exports resolved on first access, so importing the package
+# (or running a single CLI action) only pays for the modules it uses
+_LAZY_EXPORTS = {
+    "BridgeLoader": ".loader",
+    "BridgeRegistry": ".loader",
+    "CommandExecutor": ".commands",
+    "HookEngine": ".hooks",
+    "HookType": ".hooks",
+}
+
+
+def __getattr__(name: str):
+    """Lazily import re-exported submodule attributes."""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    return getattr(import_module(module_name, __name__), name)
 
 
 class Bridge:
@@ -35,18 +53,43 @@ class Bridge:
     
     def __init__(self, project_root: Path = None):
         self.project_root = Path(project_root) if project_root else Path.cwd()
-        self.loader = BridgeLoader(self.project_root)
-        self.executor = CommandExecutor(self.project_root)
-        self.hook_engine = HookEngine(self.project_root)
-        self.registry: Optional[BridgeRegistry] = None
+        self.registry: Optional["BridgeRegistry"] = None
+        self._loader: Optional["BridgeLoader"] = None
+        self._executor: Optional["CommandExecutor"] = None
+        self._hook_engine: Optional["HookEngine"] = None
+    
+    @property
+    def loader(self) -> "BridgeLoader":
+        """Component loader, created on first use."""
+        if self._loader is None:
+            from .loader import BridgeLoader
+            self._loader = BridgeLoader(self.project_root)
+        return self._loader
+    
+    @property
+    def executor(self) -> "CommandExecutor":
+        """Command executor, created on first use."""
+        if self._executor is None:
+            from .commands import CommandExecutor
+            self._executor = CommandExecutor(self.project_root)
+        return self._executor
+    
+    @property
+    def hook_engine(self) -> "HookEngine":
+        """Hook engine, created on first use."""
+        if self._hook_engine is None:
+            from .hooks import HookEngine
+            self._hook_engine = HookEngine(self.project_root)
+        return self._hook_engine
     
-    def load(self) -> BridgeRegistry:
+    def load(self) -> "BridgeRegistry":
         """Load all Claude Code components."""
         self.registry = self.loader.load_all()
         
-        # Register all hooks
-        for plugin in self.registry.plugins.values():
-            self.hook_engine.register_hooks(plugin.hooks)
+        # Register all plugin hooks in one batch
+        self.hook_engine.register_hooks_bulk(
+            plugin.hooks for plugin in self.registry.plugins.values()
+        )
         
         return self.registry
     
@@ -62,13 +105,17 @@ class Bridge:
             "plugins": list(self.registry.plugins.keys())
         }
     
-    def execute_command(self, command_name: str, arguments: List[str] = None) -> dict:
+    def execute_command(self, command_name: str, arguments: List[str] = None,
+                        include_header: bool = True) -> dict:
         """
         Execute a Claude Code command.
         
         Args:
             command_name: Name of the command (e.g., "gsd:new-project")
             arguments: List of arguments to pass
+            include_header: Prefix the prompt with the tool-restriction
+                header; callers that consume the structured fields can
+                pass False to get the bare prepared prompt
         
         Returns:
             Dict with prepared prompt and metadata
@@ -78,29 +125,42 @@ class Bridge:
         
         arguments = arguments or []
         
+        # Registry keys are interned, so lookups can match by identity
+        command_name = sys.intern(command_name)
+        
         # Find the command
         if command_name not in self.registry.commands:
             return {
                 "error": f"Command '{command_name}' not found",
-                "available": list(self.registry.commands.keys())
+                "available": self.registry.command_names
             }
         
         command = self.registry.commands[command_name]
         
+        from .hooks import HookContext, HookResult, HookType
+        
         # Execute pre-hooks
-        pre_results = self.hook_engine.execute_hooks(
-            HookType.PRE_TOOL_USE,
-            {"tool_name": "Command", "command_name": command_name, "arguments": arguments}
+        pre_result = self.hook_engine.execute(
+            HookType.PRETOOLUSE,
+            HookContext(
+                hook_type=HookType.PRETOOLUSE,
+                tool_name="Command",
+                tool_input={"command_name": command_name, "arguments": arguments},
+                project_root=str(self.project_root),
+            )
         )
         
-        if self.hook_engine.should_block_action(pre_results):
+        if pre_result == HookResult.BLOCK:
             return {
                 "blocked": True,
-                "reason": self.hook_engine.get_blocking_message(pre_results)
+                "reason": f"Command '{command_name}' was blocked by a PreToolUse hook"
             }
         
         # Prepare the prompt
-        prepared_prompt = self.executor.format_for_agent(command, arguments)
+        if include_header:
+            prepared_prompt = self.executor.format_for_agent(command, arguments)
+        else:
+            prepared_prompt = self.executor.prepare_prompt(command, arguments)
         
         return {
             "command": command_name,
@@ -124,10 +184,13 @@ class Bridge:
         if not self.registry:
             self.load()
         
+        # Registry keys are interned, so lookups can match by identity
+        agent_name = sys.intern(agent_name)
+        
         if agent_name not in self.registry.subagents:
             return {
                 "error": f"Subagent '{agent_name}' not found",
-                "available": list(self.registry.subagents.keys())
+                "available": self.registry.subagent_names
             }
         
         agent = self.registry.subagents[agent_name]
@@ -156,10 +219,13 @@ class Bridge:
         if not self.registry:
             self.load()
         
+        # Registry keys are interned, so lookups can match by identity
+        skill_name = sys.intern(skill_name)
+        
         if skill_name not in self.registry.skills:
             return {
                 "error": f"Skill '{skill_name}' not found",
-                "available": list(self.registry.skills.keys())
+                "available": self.registry.skill_names
             }
         
         skill = self.registry.skills[skill_name]
@@ -179,10 +245,31 @@ class Bridge:
         if not self.registry:
             self.load()
         return self.loader.to_json()
+    
+    def to_json_bytes(self) -> bytes:
+        """Export the entire registry as UTF-8 JSON bytes."""
+        if not self.registry:
+            self.load()
+        return self.loader.to_json_bytes()
+
+
+def _write_json_bytes(data: bytes) -> None:
+    """Write JSON bytes straight to stdout, skipping a str encode round-trip."""
+    sys.stdout.flush()
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
+
+
+def _emit_json(obj) -> None:
+    """Serialize obj and write it to stdout as JSON bytes."""
+    from .loader import dumps_json_bytes
+    _write_json_bytes(dumps_json_bytes(obj))
 
 
 def main():
     """CLI entry point."""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description="Claude Code → OpenCode Bridge",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -218,27 +305,28 @@ Examples:
         components = bridge.list_components()
         
         if args.json:
-            print(json.dumps(components, indent=2))
+            _emit_json(components)
         else:
-            print(f"\n{'='*50}")
-            print("  Claude Code Bridge - Loaded Components")
-            print(f"{'='*50}\n")
+            lines = [
+                f"\n{'='*50}",
+                "  Claude Code Bridge - Loaded Components",
+                f"{'='*50}\n",
+            ]
+            
+            lines.append(f"Commands ({len(components['commands'])}):")
+            lines.extend(f"  /{cmd}" for cmd in components['commands'])
             
-            print(f"Commands ({len(components['commands'])}):")
-            for cmd in components['commands']:
-                print(f"  /{cmd}")
+            lines.append(f"\nSubagents ({len(components['subagents'])}):")
+            lines.extend(f"  @{agent}" for agent in components['subagents'])
             
-            print(f"\nSubagents ({len(components['subagents'])}):")
-            for agent in components['subagents']:
-                print(f"  @{agent}")
+            lines.append(f"\nSkills ({len(components['skills'])}):")
+            lines.extend(f"  {skill}" for skill in components['skills'])
             
-            print(f"\nSkills ({len(components['skills'])}):")
-            for skill in components['skills']:
-                print(f"  {skill}")
+            lines.append(f"\nPlugins ({len(components['plugins'])}):")
+            lines.extend(f"  {plugin}" for plugin in components['plugins'])
             
-            print(f"\nPlugins ({len(components['plugins'])}):")
-            for plugin in components['plugins']:
-                print(f"  {plugin}")
+            # One write instead of a print per line
+            sys.stdout.write("\n".join(lines) + "\n")
     
     elif args.action == "run":
         if not args.name:
@@ -248,7 +336,7 @@ Examples:
         result = bridge.execute_command(args.name, args.args)
         
         if args.json:
-            print(json.dumps(result, indent=2))
+            _emit_json(result)
         else:
             if "error" in result:
                 print(f"Error: {result['error']}")
@@ -266,7 +354,7 @@ Examples:
         result = bridge.get_subagent(args.name)
         
         if args.json:
-            print(json.dumps(result, indent=2))
+            _emit_json(result)
         else:
             if "error" in result:
                 print(f"Error: {result['error']}")
@@ -284,7 +372,7 @@ Examples:
         result = bridge.get_skill(args.name)
         
         if args.json:
-            print(json.dumps(result, indent=2))
+            _emit_json(result)
         else:
             if "error" in result:
                 print(f"Error: {result['error']}")
@@ -295,7 +383,7 @@ Examples:
                 print(f"\nContent:\n{result['content'][:500]}...")
     
     elif args.action == "export":
-        print(bridge.to_json())
+        _write_json_bytes(bridge.to_json_bytes())
 
 
 if __name__ == "__main__":
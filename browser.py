@@ -12,17 +12,37 @@ This provides:
 - Screenshot capture
 """
 
-import os
 import json
+import select
 import subprocess
+import time
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional
 from dataclasses import dataclass
 
+try:
+    from orjson import loads as _json_loads
+except ImportError:  # orjson is optional; fall back to stdlib json
+    _json_loads = json.loads
+
 
 # Dev-browser is now bundled with cc2oc-bridge
 DEV_BROWSER_DIR = Path(__file__).parent / "dev-browser"
 
+# Seconds to wait for a single browser action
+ACTION_TIMEOUT = 30
+
+# Seconds to use one-shot clients after the persistent client fails to
+# start, before trying to start it again
+DAEMON_RETRY_DELAY = 10
+
+
+@lru_cache(maxsize=1)
+def _dev_browser_installed() -> bool:
+    """Check (once per process) whether the bundled dev-browser is present."""
+    return DEV_BROWSER_DIR.exists() and (DEV_BROWSER_DIR / "client.py").exists()
+
 
 @dataclass
 class BrowserState:
@@ -43,10 +63,17 @@ class BrowserIntegration:
     def __init__(self):
         self.dev_browser_available = self._check_dev_browser()
         self.client_script = DEV_BROWSER_DIR / "client.py"
+        # Pre-rendered str forms, reused by every action
+        self._cwd = str(DEV_BROWSER_DIR)
+        self._cmd_prefix = ("python3", str(self.client_script))
+        # Persistent `client.py --daemon` process, started on first action
+        self._daemon: Optional[subprocess.Popen] = None
+        # time.monotonic() before which no new daemon is started
+        self._daemon_retry_at = 0.0
     
     def _check_dev_browser(self) -> bool:
         """Check if dev-browser service is available."""
-        return DEV_BROWSER_DIR.exists() and (DEV_BROWSER_DIR / "client.py").exists()
+        return _dev_browser_installed()
     
     def is_available(self) -> bool:
         """Check if browser integration is available."""
@@ -73,6 +100,8 @@ class BrowserIntegration:
                 check=True
             )
             
+            # Re-probe the install on next check
+            _dev_browser_installed.cache_clear()
             return True
         except Exception as e:
             print(f"Setup failed: {e}")
@@ -126,38 +155,107 @@ class BrowserIntegration:
         """Get current browser state."""
         return self._run_action("state", {})
     
+    def close(self) -> None:
+        """Stop the persistent client process, if running."""
+        if self._daemon is None:
+            return
+        try:
+            self._daemon.stdin.close()
+            self._daemon.wait(timeout=5)
+        except Exception:
+            self._daemon.kill()
+        self._daemon = None
+    
     def _run_action(self, action: str, params: Dict[str, Any]) -> BrowserState:
         """Run a browser action via the dev-browser client."""
         if not self.dev_browser_available:
             return BrowserState()
         
+        if self._daemon is not None or time.monotonic() >= self._daemon_retry_at:
+            try:
+                data = self._run_daemon_action(action, params)
+            except TimeoutError:
+                print("Browser action timed out")
+                self.close()
+                return BrowserState()
+            
+            if data is not None:
+                if "error" in data:
+                    print(f"Browser action failed: {data['error']}")
+                    return BrowserState()
+                return self._state_from_data(data)
+        
+        return self._run_oneshot_action(action, params)
+    
+    def _run_daemon_action(self, action: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Send an action to the persistent client process.
+        
+        Returns None if the daemon cannot be started or the request cannot
+        be written, so the caller falls back to a one-shot client; starting
+        it is retried after DAEMON_RETRY_DELAY. Once the request has been
+        delivered the action may already have run, so later failures
+        return an error response rather than running it a second time.
+        """
+        try:
+            if self._daemon is None:
+                self._daemon = subprocess.Popen(
+                    [*self._cmd_prefix, "--daemon"],
+                    cwd=self._cwd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL
+                )
+            
+            request = json.dumps({"action": action, "params": params}) + "\n"
+            self._daemon.stdin.write(request.encode("utf-8"))
+            self._daemon.stdin.flush()
+        except Exception:
+            self.close()
+            self._daemon_retry_at = time.monotonic() + DAEMON_RETRY_DELAY
+            return None
+        
+        try:
+            ready, _, _ = select.select([self._daemon.stdout], [], [], ACTION_TIMEOUT)
+            if not ready:
+                raise TimeoutError
+            
+            line = self._daemon.stdout.readline()
+            if not line:
+                raise EOFError("dev-browser client exited")
+            data = _json_loads(line)
+            if not isinstance(data, dict):
+                raise ValueError("unexpected response from dev-browser client")
+            return data
+        except TimeoutError:
+            raise
+        except Exception as e:
+            self.close()
+            return {"error": str(e) or type(e).__name__}
+    
+    def _run_oneshot_action(self, action: str, params: Dict[str, Any]) -> BrowserState:
+        """Run a browser action in a fresh dev-browser client process."""
         try:
             # Build command
-            cmd = ["python3", str(self.client_script), action]
+            cmd = [*self._cmd_prefix, action]
             for key, value in params.items():
                 cmd.extend([f"--{key}", str(value)])
             
             result = subprocess.run(
                 cmd,
-                cwd=str(DEV_BROWSER_DIR),
+                cwd=self._cwd,
                 capture_output=True,
-                text=True,
-                timeout=30
+                timeout=ACTION_TIMEOUT
             )
             
+            # stdout stays bytes: the JSON parser accepts them directly
             if result.returncode == 0:
                 try:
-                    data = json.loads(result.stdout)
-                    return BrowserState(
-                        url=data.get("url", ""),
-                        title=data.get("title", ""),
-                        aria_snapshot=data.get("aria_snapshot", ""),
-                        screenshot_path=data.get("screenshot_path")
-                    )
-                except json.JSONDecodeError:
-                    return BrowserState(aria_snapshot=result.stdout)
+                    return self._state_from_data(_json_loads(result.stdout))
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    return BrowserState(aria_snapshot=result.stdout.decode("utf-8", "replace"))
             else:
-                print(f"Browser action failed: {result.stderr}")
+                print(f"Browser action failed: {result.stderr.decode('utf-8', 'replace')}")
                 return BrowserState()
                 
         except subprocess.TimeoutExpired:
@@ -166,6 +264,16 @@ class BrowserIntegration:
         except Exception as e:
             print(f"Browser action error: {e}")
             return BrowserState()
+    
+    @staticmethod
+    def _state_from_data(data: Dict[str, Any]) -> BrowserState:
+        """Build a BrowserState from a client JSON response."""
+        return BrowserState(
+            url=data.get("url", ""),
+            title=data.get("title", ""),
+            aria_snapshot=data.get("aria_snapshot", ""),
+            screenshot_path=data.get("screenshot_path")
+        )
 
 
 class BrowserTool:
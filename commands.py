@@ -6,21 +6,69 @@ Executes Claude Code commands with proper argument substitution,
 file references, and inline bash execution.
 """
 
+import os
 import re
+import shlex
+import stat
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass
+from typing import Dict, List, Tuple
 
-from .loader import Command, parse_frontmatter
+from .loader import Command, _slurp
 
+# Upper bound on inline bash commands run concurrently
+MAX_INLINE_WORKERS = 8
 
-@dataclass
-class ExecutionContext:
-    """Context for command execution."""
-    project_root: Path
-    arguments: List[str]
-    environment: Dict[str, str]
+# Characters that need a real shell to interpret an inline command
+SHELL_METACHARACTERS = frozenset("|&;<>()$`\\*?[]{}~#=!\n")
+
+# Pattern: $ARGUMENTS or positional $1..$9
+ARGUMENT_PATTERN = re.compile(r'\$(ARGUMENTS|[1-9])')
+# Pattern: @path/to/file (not followed by another @)
+FILE_REFERENCE_PATTERN = re.compile(r'@([^\s@]+)')
+# Pattern: !`command` or !`command with spaces`
+INLINE_BASH_PATTERN = re.compile(r'!\`([^`]+)\`')
+# Pattern: Tool(pattern), e.g. Bash(git:*)
+TOOL_PATTERN = re.compile(r'(\w+)\(([^)]+)\)')
+
+
+@lru_cache(maxsize=256)
+def compile_argument_template(content: str) -> Tuple[str, ...]:
+    """
+    Split a command template around its argument placeholders.
+    
+    Returns alternating literal text and placeholder names, e.g.
+    ("Review ", "1", " now") for "Review $1 now". Memoized per template,
+    so repeat executions only join the parts.
+    """
+    if "$" not in content:
+        return (content,)
+    return tuple(ARGUMENT_PATTERN.split(content))
+
+
+@lru_cache(maxsize=256)
+def parse_tool_restrictions(
+    allowed_tools: Tuple[str, ...]
+) -> Tuple[Tuple[str, ...], Tuple[Tuple[str, str], ...]]:
+    """
+    Split allowed-tools into plain tool names and (tool, pattern) pairs.
+    
+    Memoized so repeated executions of the same command skip the regex work.
+    """
+    allowed = []
+    allowed_patterns = []
+    
+    for tool in allowed_tools:
+        # Check for pattern like Bash(git:*)
+        pattern_match = TOOL_PATTERN.match(tool)
+        if pattern_match:
+            allowed_patterns.append((pattern_match.group(1), pattern_match.group(2)))
+        else:
+            allowed.append(tool)
+    
+    return tuple(allowed), tuple(allowed_patterns)
 
 
 class CommandExecutor:
@@ -51,131 +99,178 @@ class CommandExecutor:
     
     def _substitute_arguments(self, content: str, arguments: List[str]) -> str:
         """Replace $ARGUMENTS and positional $1, $2, etc."""
-        # Replace $ARGUMENTS with all arguments joined
-        all_args = " ".join(arguments)
-        content = content.replace("$ARGUMENTS", all_args)
+        parts = compile_argument_template(content)
+        if len(parts) == 1:
+            return content
         
-        # Replace positional arguments $1, $2, ..., $9
+        # $ARGUMENTS is all arguments joined; $1..$9 are positional and
+        # unprovided positionals are replaced with an empty string
+        values = {"ARGUMENTS": " ".join(arguments)}
         for i, arg in enumerate(arguments[:9], start=1):
-            content = content.replace(f"${i}", arg)
-        
-        # Remove unreplaced positional args (if not enough arguments provided)
-        for i in range(1, 10):
-            content = content.replace(f"${i}", "")
+            values[str(i)] = arg
         
-        return content
+        # Odd indices hold placeholder names, even indices literal text
+        return "".join(
+            values.get(part, "") if i % 2 else part
+            for i, part in enumerate(parts)
+        )
     
     def _resolve_file_references(self, content: str) -> str:
         """
         Resolve @path/to/file references by reading file content.
         Supports both relative and absolute paths.
         """
-        # Pattern: @path/to/file (not followed by another @)
-        pattern = r'@([^\s@]+)'
+        if "@" not in content:
+            return content
+        
+        # Each referenced file is read at most once per call
+        resolved: Dict[str, str] = {}
         
         def replace_reference(match):
             file_path = match.group(1)
-            
-            # Try relative to project root first
-            full_path = self.project_root / file_path
-            if not full_path.exists():
-                # Try absolute
-                full_path = Path(file_path).expanduser()
-            
-            if full_path.exists() and full_path.is_file():
+            if file_path not in resolved:
+                resolved[file_path] = read_reference(file_path)
+            return resolved[file_path]
+        
+        def read_reference(file_path: str) -> str:
+            # Try relative to project root first, then absolute;
+            # a single stat() per candidate covers both exists and is_file
+            for full_path in (self.project_root / file_path, Path(file_path).expanduser()):
                 try:
-                    file_content = full_path.read_text(encoding="utf-8")
-                    return f"\n--- Content of {file_path} ---\n{file_content}\n--- End of {file_path} ---\n"
-                except Exception as e:
-                    return f"[Error reading {file_path}: {e}]"
+                    st = os.stat(full_path)
+                    break
+                except OSError:
+                    continue
             else:
                 return f"[File not found: {file_path}]"
+            
+            if not stat.S_ISREG(st.st_mode):
+                return f"[File not found: {file_path}]"
+            
+            try:
+                # Newlines normalised as Path.read_text did
+                file_content = _slurp(str(full_path))
+                return f"\n--- Content of {file_path} ---\n{file_content}\n--- End of {file_path} ---\n"
+            except Exception as e:
+                return f"[Error reading {file_path}: {e}]"
         
-        return re.sub(pattern, replace_reference, content)
+        return FILE_REFERENCE_PATTERN.sub(replace_reference, content)
     
     def _execute_inline_bash(self, content: str) -> str:
         """
         Execute inline bash commands marked with !`command`.
         Returns the output substituted in place.
+        
+        Commands are independent, so they run concurrently and each
+        distinct command runs only once.
         """
-        # Pattern: !`command` or !`command with spaces`
-        pattern = r'!\`([^`]+)\`'
+        if "!`" not in content:
+            return content
         
-        def execute_and_replace(match):
-            command = match.group(1)
-            try:
+        commands = list(dict.fromkeys(
+            match.group(1) for match in INLINE_BASH_PATTERN.finditer(content)
+        ))
+        if not commands:
+            return content
+        
+        if len(commands) == 1:
+            outputs = {commands[0]: self._run_inline_command(commands[0])}
+        else:
+            with ThreadPoolExecutor(max_workers=min(MAX_INLINE_WORKERS, len(commands))) as pool:
+                outputs = dict(zip(commands, pool.map(self._run_inline_command, commands)))
+        
+        return INLINE_BASH_PATTERN.sub(lambda m: outputs[m.group(1)], content)
+    
+    def _run_inline_command(self, command: str) -> str:
+        """Run a single inline bash command and return its output."""
+        try:
+            result = None
+            
+            # Simple commands (no pipes, redirects, expansions, ...) are
+            # exec'd directly, skipping the intermediate /bin/sh process
+            if not SHELL_METACHARACTERS.intersection(command):
+                try:
+                    argv = shlex.split(command)
+                    if argv:
+                        result = subprocess.run(
+                            argv,
+                            capture_output=True,
+                            timeout=30,
+                            cwd=self.project_root
+                        )
+                except (ValueError, FileNotFoundError, PermissionError):
+                    # Unbalanced quotes, shell builtins, etc.: let the shell handle it
+                    result = None
+            
+            if result is None:
                 result = subprocess.run(
                     command,
                     shell=True,
                     capture_output=True,
-                    text=True,
                     timeout=30,
                     cwd=self.project_root
                 )
-                output = result.stdout.strip()
-                if result.returncode != 0 and result.stderr:
-                    output += f"\n[stderr: {result.stderr.strip()}]"
-                return output if output else "[no output]"
-            except subprocess.TimeoutExpired:
-                return f"[Command timed out: {command}]"
-            except Exception as e:
-                return f"[Error executing '{command}': {e}]"
-        
-        return re.sub(pattern, execute_and_replace, content)
+            
+            # Output is captured as bytes and decoded once here
+            output = result.stdout.decode("utf-8", "replace").strip()
+            if result.returncode != 0 and result.stderr:
+                output += f"\n[stderr: {result.stderr.decode('utf-8', 'replace').strip()}]"
+            return output if output else "[no output]"
+        except subprocess.TimeoutExpired:
+            return f"[Command timed out: {command}]"
+        except Exception as e:
+            return f"[Error executing '{command}': {e}]"
     
     def get_tool_restrictions(self, command: Command) -> Dict[str, List[str]]:
         """
         Parse tool restrictions from allowed-tools.
         Supports patterns like: Bash(git:*), Read, Edit
         """
-        restrictions = {
-            "allowed": [],
-            "allowed_patterns": [],
+        allowed, allowed_patterns = parse_tool_restrictions(tuple(command.allowed_tools))
+        
+        return {
+            "allowed": list(allowed),
+            "allowed_patterns": [
+                {"tool": tool_name, "pattern": pattern}
+                for tool_name, pattern in allowed_patterns
+            ],
             "disallowed": command.disallowed_tools
         }
-        
-        for tool in command.allowed_tools:
-            # Check for pattern like Bash(git:*)
-            pattern_match = re.match(r'(\w+)\(([^)]+)\)', tool)
-            if pattern_match:
-                tool_name = pattern_match.group(1)
-                pattern = pattern_match.group(2)
-                restrictions["allowed_patterns"].append({
-                    "tool": tool_name,
-                    "pattern": pattern
-                })
-            else:
-                restrictions["allowed"].append(tool)
-        
-        return restrictions
     
-    def format_for_agent(self, command: Command, arguments: List[str]) -> str:
+    def format_header(self, command: Command) -> str:
         """
-        Format the command as a complete prompt for the OpenCode agent.
-        Includes tool restrictions as instructions.
+        Build the instruction header for a command: name, tool
+        restrictions and preferred model.
         """
-        prompt = self.prepare_prompt(command, arguments)
-        
-        restrictions = self.get_tool_restrictions(command)
-        
         header = f"# Executing Command: /{command.name}\n\n"
         
-        if restrictions["allowed"]:
-            header += f"**Allowed Tools**: {', '.join(restrictions['allowed'])}\n"
-        
-        if restrictions["allowed_patterns"]:
-            patterns = [f"{p['tool']}({p['pattern']})" for p in restrictions["allowed_patterns"]]
-            header += f"**Tool Patterns**: {', '.join(patterns)}\n"
-        
-        if restrictions["disallowed"]:
-            header += f"**Disallowed Tools**: {', '.join(restrictions['disallowed'])}\n"
+        # Restriction parsing is only needed when there is something to list
+        if command.allowed_tools or command.disallowed_tools:
+            restrictions = self.get_tool_restrictions(command)
+            
+            if restrictions["allowed"]:
+                header += f"**Allowed Tools**: {', '.join(restrictions['allowed'])}\n"
+            
+            if restrictions["allowed_patterns"]:
+                patterns = [f"{p['tool']}({p['pattern']})" for p in restrictions["allowed_patterns"]]
+                header += f"**Tool Patterns**: {', '.join(patterns)}\n"
+            
+            if restrictions["disallowed"]:
+                header += f"**Disallowed Tools**: {', '.join(restrictions['disallowed'])}\n"
         
         if command.model:
             header += f"**Preferred Model**: {command.model}\n"
         
         header += "\n---\n\n"
         
-        return header + prompt
+        return header
+    
+    def format_for_agent(self, command: Command, arguments: List[str]) -> str:
+        """
+        Format the command as a complete prompt for the OpenCode agent.
+        Includes tool restrictions as instructions.
+        """
+        return self.format_header(command) + self.prepare_prompt(command, arguments)
 
 
 def main():
@@ -8,15 +8,26 @@ A sophisticated context compaction system that:
 3. Falls back to conservative defaults if unknown
 """
 
+import os
 import json
 import hashlib
 import subprocess
+import time
+import string
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 # Model context window registry (tokens)
 MODEL_CONTEXT_WINDOWS = {
@@ -57,6 +68,90 @@ MODEL_CONTEXT_WINDOWS = {
     "default": 100000,
 }
 
+# BPE encodings used for token counting (requires the optional tiktoken
+# package). Models not listed use DEFAULT_TOKEN_ENCODING, which is a close
+# enough approximation for non-OpenAI tokenizers.
+MODEL_TOKEN_ENCODINGS = {
+    "openai/gpt-4o": "o200k_base",
+    "openai/gpt-4o-mini": "o200k_base",
+    "openai/o1": "o200k_base",
+    "openai/o1-mini": "o200k_base",
+    "openai/o3": "o200k_base",
+    "gpt-4o": "o200k_base",
+}
+DEFAULT_TOKEN_ENCODING = "cl100k_base"
+
+# Seconds a captured workspace (git) state is reused before re-running git
+WORKSPACE_STATE_TTL = 2.0
+
+
+# Registry keys indexed by their model id without the provider prefix
+# (e.g. "claude-opus-4"), so "provider/.../model" ids resolve in one probe
+# (built in reverse so the first registry entry for a suffix wins)
+_MODEL_SUFFIX_INDEX: Dict[str, int] = {
+    key.lower().rsplit("/", 1)[-1]: value
+    for key, value in reversed(list(MODEL_CONTEXT_WINDOWS.items()))
+}
+
+# (lowercased key, context window) in registry order for the partial match
+_MODEL_CONTEXT_WINDOWS_LC: Tuple[Tuple[str, int], ...] = tuple(
+    (key.lower(), value) for key, value in MODEL_CONTEXT_WINDOWS.items()
+)
+
+
+@lru_cache(maxsize=32)
+def lookup_context_window(model: str) -> int:
+    """
+    Resolve a model id to its context window size.
+    
+    Order: exact registry match, then provider-less suffix match, then
+    partial substring match, then the conservative default.
+    """
+    # Look up in model registry
+    if model in MODEL_CONTEXT_WINDOWS:
+        return MODEL_CONTEXT_WINDOWS[model]
+    
+    model_lower = model.lower()
+    suffix = model_lower.rsplit("/", 1)[-1]
+    if suffix in _MODEL_SUFFIX_INDEX:
+        return _MODEL_SUFFIX_INDEX[suffix]
+    
+    # Try partial match (e.g., "claude" in model name)
+    for key_lower, value in _MODEL_CONTEXT_WINDOWS_LC:
+        if key_lower in model_lower or model_lower in key_lower:
+            return value
+    
+    # Conservative default
+    return MODEL_CONTEXT_WINDOWS["default"]
+
+
+@lru_cache(maxsize=None)
+def _get_encoder(encoding_name: str):
+    """Load a tiktoken encoder once per process; None if unavailable."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception:
+        return None
+
+
+@lru_cache(maxsize=16)
+def _count_tokens(text: str, encoding_name: str) -> int:
+    """
+    Count tokens in text, memoized so repeated checks of the same
+    conversation string cost a single pass.
+    
+    Falls back to ~4 chars per token when tiktoken is not installed.
+    """
+    encoder = _get_encoder(encoding_name)
+    if encoder is None:
+        return len(text) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+# Memory items above this importance are preserved verbatim by compaction
+PRESERVE_IMPORTANCE = 0.7
+
 
 class MemoryLayer(Enum):
     """Different layers of memory with different retention strategies."""
@@ -69,19 +164,34 @@ class MemoryLayer(Enum):
     WORKSPACE = "workspace"
 
 
+def _ns_to_datetime(ns: int) -> datetime:
+    """Convert a time.time_ns() value to a local datetime."""
+    seconds, remainder = divmod(ns, 1_000_000_000)
+    return datetime.fromtimestamp(seconds).replace(microsecond=remainder // 1000)
+
+
 @dataclass
 class MemoryItem:
     """A single item in memory."""
     layer: MemoryLayer
     content: str
-    timestamp: datetime = field(default_factory=datetime.now)
+    timestamp: int = field(default_factory=time.time_ns)  # ns since epoch
     importance: float = 0.5
     dependencies: List[str] = field(default_factory=list)
     id: str = field(default_factory=lambda: "")
     
     def __post_init__(self):
         if not self.id:
-            self.id = hashlib.md5(f"{self.content}{self.timestamp}".encode()).hexdigest()[:8]
+            # 4-byte BLAKE2b digest -> the same 8 hex chars, without hashing
+            # a throwaway concatenated string or discarding a longer digest
+            digest = hashlib.blake2b(self.content.encode(), digest_size=4)
+            digest.update(self.timestamp.to_bytes(8, "little"))
+            self.id = digest.hexdigest()
+    
+    @property
+    def timestamp_dt(self) -> datetime:
+        """The timestamp as a local datetime."""
+        return _ns_to_datetime(self.timestamp)
 
 
 @dataclass
@@ -95,33 +205,79 @@ class CompactionResult:
     summarized_items: int
 
 
+class CompactionSettings(NamedTuple):
+    """The "compaction" block of opencode.json, with defaults applied."""
+    context_window: Optional[int]
+    # Research indicates 70% is optimal for context window usage
+    # Higher thresholds risk degraded performance from "lost in the middle" effects
+    threshold: float = 0.70
+    auto: bool = True
+
+
+# Parsed opencode.json files: path -> (st_mtime_ns, config)
+_OPENCODE_CONFIG_CACHE: Dict[str, Tuple[int, Dict[str, Any]]] = {}
+
+
+def load_opencode_config() -> Dict[str, Any]:
+    """
+    Load OpenCode's configuration from the first readable config file.
+    
+    Parsed files are cached per process and re-read only when their
+    mtime changes, so constructing many OpenCodeIntegration instances
+    costs one stat() per candidate path.
+    """
+    config_paths = [
+        Path.cwd() / "opencode.json",
+        Path.cwd() / ".opencode" / "opencode.json",
+        Path.home() / ".config" / "opencode" / "opencode.json",
+    ]
+    
+    for path in config_paths:
+        try:
+            mtime_ns = os.stat(path).st_mtime_ns
+        except OSError:
+            continue
+        
+        key = str(path)
+        cached = _OPENCODE_CONFIG_CACHE.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1]
+        
+        try:
+            config = _json_loads(path.read_bytes())
+        except Exception:
+            continue
+        
+        _OPENCODE_CONFIG_CACHE[key] = (mtime_ns, config)
+        return config
+    
+    return {}
+
+
 class OpenCodeIntegration:
     """Interface with OpenCode for model and context info."""
     
     def __init__(self):
         self.config = self._load_opencode_config()
+        compaction_config = self.config.get("compaction", {})
+        self.compaction = CompactionSettings(
+            context_window=compaction_config.get("context_window"),
+            threshold=compaction_config.get("threshold", 0.70),
+            auto=compaction_config.get("auto", True),
+        )
     
     def _load_opencode_config(self) -> Dict[str, Any]:
         """Load OpenCode's configuration."""
-        config_paths = [
-            Path.cwd() / "opencode.json",
-            Path.cwd() / ".opencode" / "opencode.json",
-            Path.home() / ".config" / "opencode" / "opencode.json",
-        ]
-        
-        for path in config_paths:
-            if path.exists():
-                try:
-                    return json.loads(path.read_text(encoding="utf-8"))
-                except Exception:
-                    continue
-        
-        return {}
+        return load_opencode_config()
     
     def get_current_model(self) -> str:
         """Get the currently configured model."""
         return self.config.get("model", "default")
     
+    def get_token_encoding(self) -> str:
+        """Get the tokenizer encoding name for the current model."""
+        return MODEL_TOKEN_ENCODINGS.get(self.get_current_model(), DEFAULT_TOKEN_ENCODING)
+    
     def get_context_window_size(self) -> int:
         """
         Get the context window size for the current model.
@@ -131,37 +287,19 @@ class OpenCodeIntegration:
         2. Model registry lookup
         3. Conservative default
         """
-        model = self.get_current_model()
-        
         # Check for explicit override in config
-        compaction_config = self.config.get("compaction", {})
-        if "context_window" in compaction_config:
-            return compaction_config["context_window"]
+        if self.compaction.context_window is not None:
+            return self.compaction.context_window
         
-        # Look up in model registry
-        if model in MODEL_CONTEXT_WINDOWS:
-            return MODEL_CONTEXT_WINDOWS[model]
-        
-        # Try partial match (e.g., "claude" in model name)
-        model_lower = model.lower()
-        for key, value in MODEL_CONTEXT_WINDOWS.items():
-            if key.lower() in model_lower or model_lower in key.lower():
-                return value
-        
-        # Conservative default
-        return MODEL_CONTEXT_WINDOWS["default"]
+        return lookup_context_window(self.get_current_model())
     
     def get_compaction_threshold(self) -> float:
         """Get the threshold for triggering compaction (0-1)."""
-        compaction_config = self.config.get("compaction", {})
-        # Research indicates 70% is optimal for context window usage
-        # Higher thresholds risk degraded performance from "lost in the middle" effects
-        return compaction_config.get("threshold", 0.70)
+        return self.compaction.threshold
     
     def is_auto_compact_enabled(self) -> bool:
         """Check if auto-compaction is enabled."""
-        compaction_config = self.config.get("compaction", {})
-        return compaction_config.get("auto", True)
+        return self.compaction.auto
 
 
 COMPACTION_PROMPT = '''You are a CONTEXT COMPACTION SPECIALIST. Your job is to compress conversation history while PRESERVING CRITICAL INFORMATION.
@@ -250,6 +388,66 @@ For each significant decision:
 
 Now compact this conversation. Target: reduce to ~{target_tokens:,} tokens while preserving all critical information.'''
 
+# COMPACTION_PROMPT parsed once into (literal, field, format_spec, conversion)
+# segments so rendering only formats the values
+_COMPACTION_SEGMENTS = tuple(string.Formatter().parse(COMPACTION_PROMPT))
+
+
+def _render_compaction_prompt(values: Dict[str, Any]) -> str:
+    """Fill COMPACTION_PROMPT from pre-parsed segments."""
+    parts = []
+    for literal, name, spec, _ in _COMPACTION_SEGMENTS:
+        parts.append(literal)
+        if name is not None:
+            parts.append(format(values[name], spec))
+    return "".join(parts)
+
+
+def _dumps_indented(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+def _parse_git_status_v2(output: str) -> Tuple[str, List[str]]:
+    """
+    Parse `git status --branch --porcelain=v2 -z` output into the
+    current branch name ("" when detached) and the changed paths.
+    """
+    branch = ""
+    files = []
+    entries = iter(output.split("\0"))
+    
+    for entry in entries:
+        if not entry:
+            continue
+        if entry.startswith("# branch.head "):
+            head = entry[len("# branch.head "):]
+            branch = "" if head == "(detached)" else head
+        elif entry[0] == "1":
+            files.append(entry.split(" ", 8)[-1])
+        elif entry[0] == "2":
+            files.append(entry.split(" ", 9)[-1])
+            # Renames/copies are followed by their original path
+            next(entries, None)
+        elif entry[0] == "u":
+            files.append(entry.split(" ", 10)[-1])
+        elif entry[0] in "?!":
+            files.append(entry[2:])
+    
+    return branch, files
+
+
+def _tail_lines(text: str, count: int) -> str:
+    """Return the last `count` lines of text without splitting all of it."""
+    idx = len(text)
+    for _ in range(count):
+        idx = text.rfind("\n", 0, idx)
+        if idx == -1:
+            return text
+    return text[idx + 1:]
+
 
 class ContextCompactor:
     """
@@ -262,9 +460,23 @@ class ContextCompactor:
     def __init__(self, project_root: Path = None):
         self.project_root = project_root or Path.cwd()
         self.opencode = OpenCodeIntegration()
+        # Model settings don't change mid-session; resolve them once
+        self._context_window = self.opencode.get_context_window_size()
+        self._token_encoding = self.opencode.get_token_encoding()
+        self._threshold_tokens = int(
+            self._context_window * self.opencode.get_compaction_threshold()
+        )
         self.memory: Dict[str, MemoryItem] = {}
+        # Ids of high-importance items, kept alongside `memory` by
+        # add_memory so compaction never has to filter every item; read
+        # through _preserved_items, which also copes with direct edits
+        self._preserved_ids: Dict[str, None] = {}
         self.action_log: List[Dict[str, Any]] = []
         self.compaction_history: List[CompactionResult] = []
+        # (time.monotonic() when captured, state) from get_workspace_state
+        self._workspace_state: Optional[Tuple[float, Dict[str, Any]]] = None
+        # (state, serialized JSON) last embedded in a compaction prompt
+        self._workspace_json: Optional[Tuple[Dict[str, Any], str]] = None
     
     def add_memory(self, layer: MemoryLayer, content: str, 
                    importance: float = 0.5, dependencies: List[str] = None) -> str:
@@ -276,13 +488,34 @@ class ContextCompactor:
             dependencies=dependencies or []
         )
         self.memory[item.id] = item
+        if item.importance > PRESERVE_IMPORTANCE:
+            self._preserved_ids[item.id] = None
+        else:
+            self._preserved_ids.pop(item.id, None)
         return item.id
     
+    def _preserved_items(self) -> List[MemoryItem]:
+        """
+        High-importance items, in insertion order. Ids whose item was
+        removed from `memory` or lowered in importance are dropped.
+        """
+        items = []
+        stale = []
+        for item_id in self._preserved_ids:
+            item = self.memory.get(item_id)
+            if item is not None and item.importance > PRESERVE_IMPORTANCE:
+                items.append(item)
+            else:
+                stale.append(item_id)
+        for item_id in stale:
+            del self._preserved_ids[item_id]
+        return items
+    
     def log_action(self, action: str, files: List[str] = None, 
                    outcome: str = "success", notes: str = "") -> None:
         """Log an action to the action log (never compacted away)."""
         self.action_log.append({
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time_ns(),
             "action": action,
             "files": files or [],
             "outcome": outcome,
@@ -290,7 +523,17 @@ class ContextCompactor:
         })
     
     def get_workspace_state(self) -> Dict[str, Any]:
-        """Get current workspace state."""
+        """
+        Get current workspace state.
+        
+        Branch and file status come from a single `git status` call, and
+        the result is reused for WORKSPACE_STATE_TTL seconds so
+        back-to-back checks don't re-spawn git.
+        """
+        now = time.monotonic()
+        if self._workspace_state is not None and now - self._workspace_state[0] < WORKSPACE_STATE_TTL:
+            return self._workspace_state[1]
+        
         state = {
             "branch": "",
             "status": "",
@@ -300,35 +543,39 @@ class ContextCompactor:
         
         try:
             result = subprocess.run(
-                ["git", "branch", "--show-current"],
+                ["git", "status", "--branch", "--porcelain=v2", "-z"],
                 cwd=str(self.project_root),
                 capture_output=True, text=True, timeout=5
             )
-            state["branch"] = result.stdout.strip()
-            
-            result = subprocess.run(
-                ["git", "status", "--porcelain"],
-                cwd=str(self.project_root),
-                capture_output=True, text=True, timeout=5
-            )
-            state["modified_files"] = [
-                line[3:] for line in result.stdout.strip().split("\n") if line
-            ][:20]
+            branch, modified_files = _parse_git_status_v2(result.stdout)
+            state["branch"] = branch
+            state["modified_files"] = modified_files[:20]
             
             state["status"] = "dirty" if state["modified_files"] else "clean"
         except Exception:
             pass
         
+        self._workspace_state = (now, state)
         return state
     
     def estimate_tokens(self, text: str) -> int:
-        """Rough token estimation (4 chars per token on average)."""
-        return len(text) // 4
+        """
+        Estimate tokens with the model's BPE encoding (via tiktoken),
+        or ~4 chars per token if tiktoken is not installed.
+        """
+        return _count_tokens(text, self._token_encoding)
     
-    def get_context_info(self, conversation: str) -> Dict[str, Any]:
-        """Get context window info for current model."""
-        context_window = self.opencode.get_context_window_size()
-        current_tokens = self.estimate_tokens(conversation)
+    def get_context_info(self, conversation: str,
+                         current_tokens: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get context window info for current model.
+        
+        Pass current_tokens when the conversation has already been
+        counted to skip a second tokenization pass.
+        """
+        context_window = self._context_window
+        if current_tokens is None:
+            current_tokens = self.estimate_tokens(conversation)
         threshold = self.opencode.get_compaction_threshold()
         
         return {
@@ -345,45 +592,58 @@ class ContextCompactor:
         """Determine if compaction is needed based on OpenCode config."""
         if not self.opencode.is_auto_compact_enabled():
             return False
+        # A character never encodes to more than 4 tokens (1 for ASCII), so
+        # short conversations can't be over the threshold; skip counting
+        length = len(conversation)
+        if length * 4 <= self._threshold_tokens or (
+            length <= self._threshold_tokens and conversation.isascii()
+        ):
+            return False
         return self.get_context_info(conversation)["should_compact"]
     
-    def generate_compaction_prompt(self, conversation: str) -> str:
+    def generate_compaction_prompt(self, conversation: str,
+                                   current_tokens: Optional[int] = None) -> str:
         """Generate the compaction prompt with model-aware sizing."""
-        workspace = json.dumps(self.get_workspace_state(), indent=2)
-        info = self.get_context_info(conversation)
+        state = self.get_workspace_state()
+        if self._workspace_json is None or self._workspace_json[0] != state:
+            self._workspace_json = (state, _dumps_indented(state))
+        workspace = self._workspace_json[1]
+        info = self.get_context_info(conversation, current_tokens)
         
         # Target 50% of context window after compaction
         target_tokens = info["context_window"] // 2
         
-        return COMPACTION_PROMPT.format(
-            model=info["model"],
-            context_window=info["context_window"],
-            current_tokens=info["current_tokens"],
-            usage_percent=info["usage_percent"],
-            target_tokens=target_tokens,
-            conversation=conversation,
-            workspace_state=workspace
-        )
+        return _render_compaction_prompt({
+            "model": info["model"],
+            "context_window": info["context_window"],
+            "current_tokens": info["current_tokens"],
+            "usage_percent": info["usage_percent"],
+            "target_tokens": target_tokens,
+            "conversation": conversation,
+            "workspace_state": workspace
+        })
     
     def compact(self, conversation: str, llm_fn: callable = None) -> CompactionResult:
         """Compact a conversation using the layered memory model."""
         original_tokens = self.estimate_tokens(conversation)
         
         if llm_fn:
-            prompt = self.generate_compaction_prompt(conversation)
+            prompt = self.generate_compaction_prompt(conversation, original_tokens)
             compacted = llm_fn(prompt)
         else:
             compacted = self._rule_based_compact(conversation)
         
         compacted_tokens = self.estimate_tokens(compacted)
+        # Every item is either preserved (indexed by add_memory) or summarized
+        preserved_items = len(self._preserved_items())
         
         result = CompactionResult(
             compacted_context=compacted,
             original_tokens=original_tokens,
             compacted_tokens=compacted_tokens,
             compression_ratio=compacted_tokens / original_tokens if original_tokens > 0 else 1.0,
-            preserved_items=len([m for m in self.memory.values() if m.importance > 0.7]),
-            summarized_items=len([m for m in self.memory.values() if m.importance <= 0.7])
+            preserved_items=preserved_items,
+            summarized_items=len(self.memory) - preserved_items
         )
         
         self.compaction_history.append(result)
@@ -391,20 +651,17 @@ class ContextCompactor:
     
     def _rule_based_compact(self, conversation: str) -> str:
         """Rule-based compaction when LLM is not available."""
-        lines = conversation.split("\n")
-        
         action_log_text = "\n".join([
-            f"[{a['timestamp']}] {a['action']} -> {a['outcome']}"
+            f"[{_ns_to_datetime(a['timestamp']).isoformat()}] {a['action']} -> {a['outcome']}"
             for a in self.action_log[-20:]
         ])
         
         important_memory = "\n".join([
-            f"[{m.layer.value}] {m.content[:200]}"
-            for m in self.memory.values()
-            if m.importance > 0.7
+            f"[{item.layer.value}] {item.content[:200]}"
+            for item in self._preserved_items()
         ])
         
-        recent = lines[-50:]
+        recent = _tail_lines(conversation, 50)
         
         return f"""# Session Context (Auto-Compacted)
 
@@ -415,7 +672,7 @@ class ContextCompactor:
 {important_memory or "No high-priority items"}
 
 ## Recent Context
-{chr(10).join(recent)}
+{recent}
 """
 
 
@@ -13,6 +13,8 @@ Usage:
     await auth.ensure_logged_in(client, "linkedin")
 """
 
+from __future__ import annotations
+
 import os
 import re
 import hmac
@@ -20,17 +22,43 @@ import struct
 import time
 import hashlib
 import base64
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 from dataclasses import dataclass, field
 
-from dotenv import load_dotenv
-from playwright.async_api import Page
+if TYPE_CHECKING:
+    from playwright.async_api import Page
 
 
-# Load .env from this service's directory
+# .env in this service's directory, loaded by the first AuthManager
 SERVICE_DIR = Path(__file__).parent
-load_dotenv(SERVICE_DIR / ".env")
+
+# Runs in the page: tests visible text against the indicator pattern so only a
+# boolean crosses CDP instead of the serialized DOM
+LOGGED_OUT_PROBE = """(source) => {
+    const body = document.body ? document.body.innerText : "";
+    return new RegExp(source, "i").test(document.title + "\\n" + body);
+}"""
+
+# (attribute, operator) pairs tried for each field type in _fill_field_by_type
+FIELD_ATTRIBUTES = (("type", "="), ("name", "*="), ("id", "*="), ("placeholder", "*="))
+FIELD_WAIT_TIMEOUT = 2000  # ms
+FORM_WAIT_TIMEOUT = 5000  # ms, for the login form after navigation
+
+# Every known 2FA input as a single selector list
+TWO_FA_SELECTOR = ", ".join(
+    f"{selector}:visible"
+    for selector in (
+        "input[name*='code']",
+        "input[name*='otp']",
+        "input[name*='totp']",
+        "input[name*='2fa']",
+        "input[type='tel']",
+        "input[autocomplete='one-time-code']",
+    )
+)
+TWO_FA_WAIT_TIMEOUT = 5000  # ms
 
 
 @dataclass
@@ -46,6 +74,16 @@ class SiteConfig:
     submit_selector: Optional[str] = None
     totp_secret: Optional[str] = None  # For 2FA
     post_login_wait: float = 3.0  # Seconds to wait after login
+    logged_in_selector: Optional[str] = None  # Element only present when signed in
+    # All logged_out_indicators as one case-insensitive alternation
+    indicator_pattern: Optional[re.Pattern] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self):
+        if self.logged_out_indicators:
+            self.indicator_pattern = re.compile(
+                "|".join(map(re.escape, self.logged_out_indicators)),
+                re.IGNORECASE,
+            )
 
 
 # Pre-configured sites with known login flows
@@ -109,21 +147,16 @@ KNOWN_SITES: dict[str, dict] = {
 }
 
 
-def generate_totp(secret: str) -> str:
-    """
-    Generate a TOTP code from a base32-encoded secret.
-
-    Args:
-        secret: Base32-encoded TOTP secret
+@lru_cache(maxsize=32)
+def _decode_totp_secret(secret: str) -> bytes:
+    """Decode a base32 TOTP secret once per distinct secret."""
+    return base64.b32decode(secret.upper().replace(" ", ""))
 
-    Returns:
-        6-digit TOTP code
-    """
-    # Decode base32 secret
-    key = base64.b32decode(secret.upper().replace(" ", ""))
 
-    # Get current time step (30 second intervals)
-    counter = int(time.time() // 30)
+@lru_cache(maxsize=32)
+def _totp(secret: str, counter: int) -> str:
+    """Compute the TOTP code for one 30-second time step."""
+    key = _decode_totp_secret(secret)
 
     # Pack counter as big-endian 64-bit integer
     counter_bytes = struct.pack(">Q", counter)
@@ -139,6 +172,20 @@ def generate_totp(secret: str) -> str:
     return str(code_int % 1000000).zfill(6)
 
 
+def generate_totp(secret: str) -> str:
+    """
+    Generate a TOTP code from a base32-encoded secret.
+
+    Args:
+        secret: Base32-encoded TOTP secret
+
+    Returns:
+        6-digit TOTP code
+    """
+    # Get current time step (30 second intervals); codes repeat within a step
+    return _totp(secret, int(time.time() // 30))
+
+
 class AuthManager:
     """
     Manages authentication for Dev Browser pages.
@@ -147,17 +194,26 @@ class AuthManager:
     automatic re-login when sessions expire.
     """
 
+    _dotenv_loaded = False
+
     def __init__(self):
+        if not AuthManager._dotenv_loaded:
+            from dotenv import load_dotenv
+            load_dotenv(SERVICE_DIR / ".env")
+            AuthManager._dotenv_loaded = True
         self.sites: dict[str, SiteConfig] = {}
         self._load_credentials()
 
     def _load_credentials(self) -> None:
         """Load credentials from environment variables."""
+        # One snapshot of the environment for every lookup below
+        env = dict(os.environ)
+
         # Load known sites
         for site_name, site_defaults in KNOWN_SITES.items():
             env_prefix = site_name.upper()
-            email = os.getenv(f"{env_prefix}_EMAIL")
-            password = os.getenv(f"{env_prefix}_PASSWORD")
+            email = env.get(f"{env_prefix}_EMAIL")
+            password = env.get(f"{env_prefix}_PASSWORD")
 
             if email and password:
                 self.sites[site_name] = SiteConfig(
@@ -169,19 +225,20 @@ class AuthManager:
                     email_selector=site_defaults.get("email_selector"),
                     password_selector=site_defaults.get("password_selector"),
                     submit_selector=site_defaults.get("submit_selector"),
-                    totp_secret=os.getenv(f"{env_prefix}_2FA_SECRET"),
+                    totp_secret=env.get(f"{env_prefix}_2FA_SECRET"),
                     post_login_wait=site_defaults.get("post_login_wait", 3.0),
+                    logged_in_selector=site_defaults.get("logged_in_selector"),
                 )
 
         # Load custom sites (scan for SITENAME_LOGIN_URL pattern)
-        for key in os.environ:
+        for key, login_url in env.items():
             if key.endswith("_LOGIN_URL"):
-                site_name = key.replace("_LOGIN_URL", "").lower()
+                site_name = key[:-len("_LOGIN_URL")].lower()
                 if site_name not in self.sites:
-                    email = os.getenv(f"{site_name.upper()}_EMAIL")
-                    password = os.getenv(f"{site_name.upper()}_PASSWORD")
-                    login_url = os.getenv(key)
-                    indicator = os.getenv(f"{site_name.upper()}_LOGGED_OUT_INDICATOR", "sign in")
+                    env_prefix = site_name.upper()
+                    email = env.get(f"{env_prefix}_EMAIL")
+                    password = env.get(f"{env_prefix}_PASSWORD")
+                    indicator = env.get(f"{env_prefix}_LOGGED_OUT_INDICATOR", "sign in")
 
                     if email and password and login_url:
                         self.sites[site_name] = SiteConfig(
@@ -190,7 +247,8 @@ class AuthManager:
                             password=password,
                             login_url=login_url,
                             logged_out_indicators=[indicator],
-                            totp_secret=os.getenv(f"{site_name.upper()}_2FA_SECRET"),
+                            totp_secret=env.get(f"{env_prefix}_2FA_SECRET"),
+                            logged_in_selector=env.get(f"{env_prefix}_LOGGED_IN_SELECTOR"),
                         )
 
     def get_site(self, site_name: str) -> Optional[SiteConfig]:
@@ -203,7 +261,7 @@ class AuthManager:
 
     async def is_logged_out(self, page: Page, site_name: str) -> bool:
         """
-        Check if the user is logged out based on page content.
+        Check if the user is logged out based on the page's visible text.
 
         Args:
             page: Playwright page
@@ -217,14 +275,14 @@ class AuthManager:
             return False
 
         try:
-            content = await page.content()
-            content_lower = content.lower()
+            if site.logged_in_selector:
+                if await page.locator(site.logged_in_selector).count() > 0:
+                    return False
 
-            for indicator in site.logged_out_indicators:
-                if indicator.lower() in content_lower:
-                    return True
+            if site.indicator_pattern is None:
+                return False
 
-            return False
+            return await page.evaluate(LOGGED_OUT_PROBE, site.indicator_pattern.pattern)
         except Exception:
             return False
 
@@ -245,8 +303,11 @@ class AuthManager:
 
         try:
             # Navigate to login page
-            await page.goto(site.login_url, wait_until="networkidle")
-            await page.wait_for_timeout(1000)
+            # DOM readiness plus the form itself, not every tracker request
+            await page.goto(site.login_url, wait_until="domcontentloaded")
+            await page.locator(site.email_selector or "input:visible").first.wait_for(
+                state="visible", timeout=FORM_WAIT_TIMEOUT
+            )
 
             # Fill email
             if site.email_selector:
@@ -304,24 +365,19 @@ class AuthManager:
         value: str
     ) -> bool:
         """Try to fill a field by common patterns."""
-        for field_type in field_types:
-            selectors = [
-                f"input[type='{field_type}']",
-                f"input[name*='{field_type}']",
-                f"input[id*='{field_type}']",
-                f"input[placeholder*='{field_type}']",
-            ]
-
-            for selector in selectors:
-                try:
-                    element = page.locator(selector).first
-                    if await element.is_visible(timeout=1000):
-                        await element.fill(value)
-                        return True
-                except Exception:
-                    continue
-
-        return False
+        # One combined query instead of a visibility probe per pattern
+        selector = ", ".join(
+            f"input[{attr}{op}'{field_type}']:visible"
+            for field_type in field_types
+            for attr, op in FIELD_ATTRIBUTES
+        )
+        try:
+            element = page.locator(selector).first
+            await element.wait_for(state="visible", timeout=FIELD_WAIT_TIMEOUT)
+            await element.fill(value)
+            return True
+        except Exception:
+            return False
 
     async def _handle_2fa(self, page: Page, site: SiteConfig) -> None:
         """Handle 2FA if a TOTP secret is configured."""
@@ -329,32 +385,19 @@ class AuthManager:
             return
 
         try:
-            # Wait for 2FA input to appear
-            await page.wait_for_timeout(2000)
+            # Wait for any 2FA input to appear
+            element = page.locator(TWO_FA_SELECTOR).first
+            try:
+                await element.wait_for(state="visible", timeout=TWO_FA_WAIT_TIMEOUT)
+            except Exception:
+                return
 
             # Generate TOTP code
             code = generate_totp(site.totp_secret)
 
-            # Try to find 2FA input
-            selectors = [
-                "input[name*='code']",
-                "input[name*='otp']",
-                "input[name*='totp']",
-                "input[name*='2fa']",
-                "input[type='tel']",
-                "input[autocomplete='one-time-code']",
-            ]
-
-            for selector in selectors:
-                try:
-                    element = page.locator(selector).first
-                    if await element.is_visible(timeout=1000):
-                        await element.fill(code)
-                        await page.keyboard.press("Enter")
-                        await page.wait_for_timeout(3000)
-                        return
-                except Exception:
-                    continue
+            await element.fill(code)
+            await page.keyboard.press("Enter")
+            await page.wait_for_timeout(3000)
 
         except Exception as e:
             print(f"2FA handling failed: {e}")
@@ -392,7 +435,7 @@ class AuthManager:
 
         # Navigate to requested URL if provided
         if navigate_to:
-            await page.goto(navigate_to, wait_until="networkidle")
+            await page.goto(navigate_to, wait_until="domcontentloaded")
 
             # Check again after navigation
             if await self.is_logged_out(page, site_name):
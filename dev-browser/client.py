@@ -25,8 +25,10 @@ Usage:
 """
 
 import asyncio
-import subprocess
+import json
+import sys
 import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional
 from dataclasses import dataclass
@@ -34,7 +36,269 @@ from dataclasses import dataclass
 import httpx
 from playwright.async_api import async_playwright, Page, Browser
 
-from .auth_manager import AuthManager, get_auth_manager
+try:
+    from .auth_manager import AuthManager, get_auth_manager
+except ImportError:
+    from auth_manager import AuthManager, get_auth_manager
+
+
+# Page used by the bridge's action CLI (see BrowserIntegration in browser.py)
+CLI_PAGE_NAME = "main"
+
+# Server output when auto-started (in this directory, git-ignored via *.log)
+SERVER_LOG_NAME = "server.log"
+
+# Most (page name, URL) snapshots kept for get_ai_snapshot(cache_ttl=...)
+SNAPSHOT_CACHE_SIZE = 100
+
+# Backoff between readiness checks while a started server boots (seconds)
+SERVER_POLL_INITIAL = 0.025
+SERVER_POLL_MAX = 0.25
+
+# Connection pool shared by every client in the process
+HTTP_LIMITS = httpx.Limits(
+    max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0
+)
+
+# (event loop, client): httpx clients can't be used across event loops
+_shared_http: Optional[tuple] = None
+
+
+def _shared_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client for the running event loop."""
+    global _shared_http
+    loop = asyncio.get_running_loop()
+    if _shared_http is None or _shared_http[0] is not loop or _shared_http[1].is_closed:
+        _shared_http = (loop, httpx.AsyncClient(limits=HTTP_LIMITS))
+    return _shared_http[1]
+
+
+async def shutdown_module() -> None:
+    """Close the shared HTTP client."""
+    global _shared_http
+    if _shared_http is not None:
+        _, client = _shared_http
+        _shared_http = None
+        await client.aclose()
+
+
+# ARIA snapshot generator injected into pages (condensed from
+# src/snapshot/browser-script.ts). It provides:
+# - window.__devBrowser_getAISnapshot(): YAML representation of page structure
+# - window.__devBrowser_selectSnapshotRef(ref): Get element by ref
+# - window.__devBrowserRefs: Map of ref -> element
+_SNAPSHOT_SCRIPT = """
+(function() {
+  if (window.__devBrowser_getAISnapshot) return;
+
+  // Simplified ARIA snapshot implementation
+  let cacheStyle;
+  let cachesCounter = 0;
+
+  function beginDOMCaches() { ++cachesCounter; cacheStyle = cacheStyle || new Map(); }
+  function endDOMCaches() { if (!--cachesCounter) cacheStyle = undefined; }
+
+  function getElementComputedStyle(element, pseudo) {
+    const cache = cacheStyle;
+    const cacheKey = pseudo ? undefined : element;
+    if (cache && cacheKey && cache.has(cacheKey)) return cache.get(cacheKey);
+    const style = element.ownerDocument?.defaultView?.getComputedStyle(element, pseudo);
+    if (cache && cacheKey) cache.set(cacheKey, style);
+    return style;
+  }
+
+  function isElementVisible(element) {
+    const style = getElementComputedStyle(element);
+    if (!style || style.display === 'none' || style.visibility === 'hidden') return false;
+    const rect = element.getBoundingClientRect();
+    return rect.width > 0 && rect.height > 0;
+  }
+
+  function getAriaRole(element) {
+    const explicit = element.getAttribute('role');
+    if (explicit) return explicit;
+
+    const tagRoles = {
+      A: (e) => e.hasAttribute('href') ? 'link' : null,
+      BUTTON: () => 'button',
+      INPUT: (e) => {
+        const type = e.type?.toLowerCase() || 'text';
+        const roles = { button: 'button', checkbox: 'checkbox', radio: 'radio', submit: 'button', reset: 'button' };
+        return roles[type] || 'textbox';
+      },
+      SELECT: () => 'combobox',
+      TEXTAREA: () => 'textbox',
+      IMG: () => 'img',
+      H1: () => 'heading', H2: () => 'heading', H3: () => 'heading',
+      H4: () => 'heading', H5: () => 'heading', H6: () => 'heading',
+      UL: () => 'list', OL: () => 'list', LI: () => 'listitem',
+      NAV: () => 'navigation', MAIN: () => 'main', HEADER: () => 'banner',
+      FOOTER: () => 'contentinfo', ARTICLE: () => 'article', SECTION: () => 'region',
+    };
+
+    const fn = tagRoles[element.tagName];
+    return fn ? fn(element) : null;
+  }
+
+  function getAccessibleName(element) {
+    const ariaLabel = element.getAttribute('aria-label');
+    if (ariaLabel) return ariaLabel.trim();
+
+    const labelledBy = element.getAttribute('aria-labelledby');
+    if (labelledBy) {
+      const labels = labelledBy.split(' ').map(id => document.getElementById(id)?.textContent || '').join(' ');
+      if (labels.trim()) return labels.trim();
+    }
+
+    if (element.tagName === 'IMG') return element.getAttribute('alt') || '';
+    if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') {
+      const label = document.querySelector(`label[for="${element.id}"]`);
+      if (label) return label.textContent?.trim() || '';
+      return element.placeholder || '';
+    }
+
+    return element.textContent?.trim().slice(0, 100) || '';
+  }
+
+  let refCounter = 0;
+
+  function generateSnapshot(root) {
+    // Plain object, the shape the TypeScript client also reads from
+    // window.__devBrowserRefs, filled directly so no conversion is needed
+    const elements = {};
+    const lines = [];
+    // Pre-order walk on an explicit stack of (element, indent) pairs instead
+    // of recursion; an invisible element prunes its whole subtree
+    const stack = [root, ''];
+
+    function pushChildren(element, indent) {
+      const children = element.children;
+      for (let i = children.length - 1; i >= 0; i--) stack.push(children[i], indent);
+    }
+
+    beginDOMCaches();
+    try {
+      // The walk only reads the DOM, so flushing layout once up front means
+      // no per-element getBoundingClientRect() below forces a reflow
+      if (root) root.getBoundingClientRect();
+
+      while (stack.length) {
+        const indent = stack.pop();
+        const element = stack.pop();
+        if (!element || element.nodeType !== 1) continue;
+        if (!isElementVisible(element)) continue;
+
+        const role = getAriaRole(element);
+        const name = getAccessibleName(element);
+
+        // Skip generic/uninteresting elements
+        if (!role && !name && element.children.length <= 1) {
+          pushChildren(element, indent);
+          continue;
+        }
+
+        const ref = 'e' + (++refCounter);
+        elements[ref] = element;
+
+        let line = indent + '- ';
+        if (role) line += role;
+        if (name) line += ' "' + name.replace(/"/g, '\\\\"').slice(0, 50) + '"';
+        line += ' [ref=' + ref + ']';
+
+        // Add state attributes
+        if (element.disabled) line += ' [disabled]';
+        if (element.checked) line += ' [checked]';
+        if (element.getAttribute('aria-expanded') === 'true') line += ' [expanded]';
+
+        lines.push(line);
+        pushChildren(element, indent + '  ');
+      }
+    } finally {
+      endDOMCaches();
+    }
+
+    return { yaml: lines.join('\\n'), elements };
+  }
+
+  window.__devBrowser_getAISnapshot = function() {
+    refCounter = 0;
+    const snapshot = generateSnapshot(document.body);
+    window.__devBrowserRefs = snapshot.elements;
+    window.__devBrowser_lastSnapshot = snapshot.yaml;
+    return snapshot.yaml;
+  };
+
+  // Rebuilds refs but keeps the YAML in the page; returns the ref count
+  window.__devBrowser_refreshRefs = function() {
+    window.__devBrowser_getAISnapshot();
+    return refCounter;
+  };
+
+  window.__devBrowser_selectSnapshotRef = function(ref) {
+    const refs = window.__devBrowserRefs;
+    if (!refs) throw new Error('No snapshot refs found. Call getAISnapshot first.');
+    const element = refs[ref];
+    if (!element) throw new Error('Ref "' + ref + '" not found.');
+    return element;
+  };
+})();
+"""
+
+# Per-snapshot call once the generator is installed; null means inject first
+_SNAPSHOT_CALL = "() => window.__devBrowser_getAISnapshot ? window.__devBrowser_getAISnapshot() : null"
+
+# Installs the generator (if missing) and takes a snapshot in one round-trip
+_SNAPSHOT_INJECT = """
+    (script) => {
+        if (!window.__devBrowser_getAISnapshot) {
+            (new Function(script))();
+        }
+        return window.__devBrowser_getAISnapshot();
+    }
+"""
+
+# Installs the generator if missing, without taking a snapshot
+_SNAPSHOT_INSTALL = """
+    (script) => {
+        if (!window.__devBrowser_getAISnapshot) {
+            (new Function(script))();
+        }
+    }
+"""
+
+# Rebuilds refs in the page and returns only their count; null means install
+# first. A generator installed by the TypeScript client lacks refreshRefs, so
+# snapshot through it and keep the YAML in the page ourselves
+_REFRESH_REFS_CALL = """
+    () => {
+        if (window.__devBrowser_refreshRefs) {
+            return window.__devBrowser_refreshRefs();
+        }
+        if (window.__devBrowser_getAISnapshot) {
+            window.__devBrowser_lastSnapshot = window.__devBrowser_getAISnapshot();
+            return Object.keys(window.__devBrowserRefs || {}).length;
+        }
+        return null;
+    }
+"""
+
+# YAML of the page's most recent snapshot, kept in the page by the generator
+_LAST_SNAPSHOT_CALL = "() => window.__devBrowser_lastSnapshot ?? null"
+
+# Resolves a ref from the last snapshot to its element
+_SELECT_REF = """
+    (refId) => {
+        const refs = window.__devBrowserRefs;
+        if (!refs) {
+            throw new Error("No snapshot refs found. Call get_ai_snapshot first.");
+        }
+        const element = refs[refId];
+        if (!element) {
+            throw new Error(`Ref "${refId}" not found. Available refs: ${Object.keys(refs).join(", ")}`);
+        }
+        return element;
+    }
+"""
 
 
 @dataclass
@@ -87,6 +351,9 @@ class DevBrowserClient:
             enable_auth: Enable auto-login functionality (loads credentials from .env)
         """
         self.server_url = server_url.rstrip("/")
+        # Parsed once; httpx would otherwise re-parse the string per request
+        self._url_server = httpx.URL(self.server_url)
+        self._url_pages = httpx.URL(f"{self.server_url}/pages")
         self.auto_start = auto_start
         self.headless = headless
         self.timeout = timeout
@@ -96,8 +363,18 @@ class DevBrowserClient:
         self._playwright = None
         self._browser: Optional[Browser] = None
         self._ws_endpoint: Optional[str] = None
-        self._server_process: Optional[subprocess.Popen] = None
+        self._server_process: Optional[asyncio.subprocess.Process] = None
         self._auth_manager: Optional[AuthManager] = None
+        # Resolved pages, so repeat lookups skip the server and CDP scan
+        self._page_by_name: dict[str, Page] = {}
+        self._page_by_target: dict[str, Page] = {}
+        self._target_by_page: dict[Page, str] = {}
+        # Pages with the snapshot generator registered as an init script
+        self._snapshot_pages: set[Page] = set()
+        # Browser-level CDP session for Target.* queries, opened on first use
+        self._root_cdp = None
+        # (page name, url) -> (time.monotonic() when taken, snapshot), LRU order
+        self._snapshot_cache: OrderedDict[tuple[str, str], tuple[float, str]] = OrderedDict()
 
         # Initialize auth manager if enabled
         if enable_auth:
@@ -122,8 +399,27 @@ class DevBrowserClient:
 
         If auto_start is True and server isn't running, starts it automatically.
         """
-        self._http_client = httpx.AsyncClient(timeout=self.timeout)
+        self._http_client = _shared_http_client()
 
+        # Boot the Playwright driver while the server is checked or started
+        playwright_start = asyncio.ensure_future(async_playwright().start())
+        try:
+            info = await self._ensure_server()
+        except BaseException:
+            try:
+                await (await playwright_start).stop()
+            except Exception:
+                pass
+            raise
+
+        self._ws_endpoint = info["wsEndpoint"]
+
+        # Connect Playwright to browser
+        self._playwright = await playwright_start
+        self._browser = await self._playwright.chromium.connect_over_cdp(self._ws_endpoint)
+
+    async def _ensure_server(self) -> dict:
+        """Make sure the server is up (starting it if allowed) and return its info."""
         # Check if server is running
         if not await self._is_server_running():
             if self.auto_start:
@@ -135,15 +431,23 @@ class DevBrowserClient:
                 )
 
         # Get WebSocket endpoint
-        info = await self._get_server_info()
-        self._ws_endpoint = info["wsEndpoint"]
-
-        # Connect Playwright to browser
-        self._playwright = await async_playwright().start()
-        self._browser = await self._playwright.chromium.connect_over_cdp(self._ws_endpoint)
+        return await self._get_server_info()
 
     async def disconnect(self) -> None:
         """Disconnect from the server (pages persist on server)."""
+        self._page_by_name.clear()
+        self._page_by_target.clear()
+        self._target_by_page.clear()
+        self._snapshot_pages.clear()
+        self._snapshot_cache.clear()
+
+        if self._root_cdp is not None:
+            try:
+                await self._root_cdp.detach()
+            except Exception:
+                pass
+            self._root_cdp = None
+
         if self._browser:
             await self._browser.close()
             self._browser = None
@@ -152,14 +456,13 @@ class DevBrowserClient:
             await self._playwright.stop()
             self._playwright = None
 
-        if self._http_client:
-            await self._http_client.aclose()
-            self._http_client = None
+        # The shared HTTP client stays open for other clients; see shutdown_module()
+        self._http_client = None
 
     async def _is_server_running(self) -> bool:
         """Check if server is running."""
         try:
-            response = await self._http_client.get(self.server_url, timeout=2.0)
+            response = await self._http_client.get(self._url_server, timeout=2.0)
             return response.status_code == 200
         except Exception:
             return False
@@ -180,29 +483,40 @@ class DevBrowserClient:
         if self.headless:
             cmd.append("--headless")
 
-        # Start server in background
-        self._server_process = subprocess.Popen(
-            cmd,
-            cwd=str(service_dir),
-            stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-        )
+        # Start server in background. Output goes to a log file rather than
+        # pipes nobody drains: the server outlives this client, and a full
+        # pipe buffer would stall it
+        log_path = service_dir / SERVER_LOG_NAME
+        with open(log_path, "ab") as log_file:
+            self._server_process = await asyncio.create_subprocess_exec(
+                *cmd,
+                cwd=str(service_dir),
+                stdout=log_file,
+                stderr=asyncio.subprocess.STDOUT,
+            )
 
-        # Wait for server to be ready
-        start_time = time.time()
-        while time.time() - start_time < self.timeout:
+        # Wait for server to be ready, polling quickly at first
+        delay = SERVER_POLL_INITIAL
+        deadline = time.monotonic() + self.timeout
+        while time.monotonic() < deadline:
             if await self._is_server_running():
                 return
-            await asyncio.sleep(0.5)
+            if self._server_process.returncode is not None:
+                raise RuntimeError(
+                    f"Dev Browser server exited with code "
+                    f"{self._server_process.returncode}. See {log_path}"
+                )
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 1.5, SERVER_POLL_MAX)
 
         raise TimeoutError(
             f"Dev Browser server failed to start within {self.timeout}s. "
-            "Check logs for errors."
+            f"Check {log_path} for errors."
         )
 
     async def _get_server_info(self) -> dict:
         """Get server information including WebSocket endpoint."""
-        response = await self._http_client.get(self.server_url)
+        response = await self._http_client.get(self._url_server, timeout=self.timeout)
         response.raise_for_status()
         return response.json()
 
@@ -211,7 +525,8 @@ class DevBrowserClient:
         Get or create a named page.
 
         Pages persist on the server until explicitly closed.
-        Multiple scripts can access the same page by name.
+        Multiple scripts can access the same page by name. Resolved
+        pages are cached by name until they are closed.
 
         Args:
             name: Unique name for the page
@@ -222,39 +537,127 @@ class DevBrowserClient:
         if not self._browser:
             raise RuntimeError("Not connected. Call connect() first.")
 
+        page = self._page_by_name.get(name)
+        if page is not None:
+            if not page.is_closed():
+                return page
+            self._forget_page(page)
+
         # Request page from server
         response = await self._http_client.post(
-            f"{self.server_url}/pages",
-            json={"name": name}
+            self._url_pages,
+            json={"name": name},
+            timeout=self.timeout,
         )
         response.raise_for_status()
         page_info = response.json()
 
         # Find page by target ID
         target_id = page_info["targetId"]
+        page = self._page_by_target.get(target_id)
+        if page is not None and page.is_closed():
+            self._forget_page(page)
+            page = None
+
+        if page is None:
+            page = await self._find_page_by_target(target_id, page_info.get("url"))
+            if page is None:
+                raise RuntimeError(f"Page '{name}' not found in browser contexts")
+
+        # Preload the snapshot generator into every future document of the page
+        if page not in self._snapshot_pages:
+            await page.add_init_script(_SNAPSHOT_SCRIPT)
+            self._snapshot_pages.add(page)
+
+        self._page_by_name[name] = page
+        return page
 
-        for context in self._browser.contexts:
-            for page in context.pages:
-                cdp = await context.new_cdp_session(page)
-                try:
-                    info = await cdp.send("Target.getTargetInfo")
-                    if info["targetInfo"]["targetId"] == target_id:
-                        return page
-                finally:
-                    await cdp.detach()
+    async def _find_page_by_target(
+        self, target_id: str, url: Optional[str] = None
+    ) -> Optional[Page]:
+        """Scan browser pages for a target, reading each page's id only once."""
+        unknown = [
+            (context, page)
+            for context in self._browser.contexts
+            for page in context.pages
+            if page not in self._target_by_page
+        ]
+
+        # Probe pages already showing the target's URL first and the rest
+        # only on a miss. The server reports the URL; older servers don't,
+        # so fall back to one browser-level Target.getTargets
+        if len(unknown) > 1:
+            if url is None:
+                url = await self._target_url(target_id)
+            likely = [entry for entry in unknown if entry[1].url == url]
+            if likely and len(likely) < len(unknown):
+                page = await self._identify_pages(likely, target_id)
+                if page is not None:
+                    return page
+                unknown = [entry for entry in unknown if entry[1].url != url]
+
+        return await self._identify_pages(unknown, target_id)
+
+    async def _identify_pages(self, entries: list, target_id: str) -> Optional[Page]:
+        """Read the target ids of (context, page) pairs concurrently and cache them."""
+        # Identify every new page concurrently instead of one attach at a time
+        target_ids = await asyncio.gather(
+            *(self._read_target_id(context, page) for context, page in entries)
+        )
+        for (_, page), page_target in zip(entries, target_ids):
+            self._target_by_page[page] = page_target
+            self._page_by_target[page_target] = page
+
+        return self._page_by_target.get(target_id)
 
-        raise RuntimeError(f"Page '{name}' not found in browser contexts")
+    async def _target_url(self, target_id: str) -> Optional[str]:
+        """Look up a target's URL over the persistent browser-level CDP session."""
+        try:
+            if self._root_cdp is None:
+                self._root_cdp = await self._browser.new_browser_cdp_session()
+            targets = await self._root_cdp.send("Target.getTargets")
+        except Exception:
+            return None
+
+        for info in targets["targetInfos"]:
+            if info["targetId"] == target_id:
+                return info["url"]
+        return None
+
+    @staticmethod
+    async def _read_target_id(context, page: Page) -> str:
+        """Read a page's CDP target id through a short-lived session."""
+        cdp = await context.new_cdp_session(page)
+        try:
+            info = await cdp.send("Target.getTargetInfo")
+        finally:
+            await cdp.detach()
+        return info["targetInfo"]["targetId"]
+
+    def _forget_page(self, page: Page) -> None:
+        """Drop a page from the lookup caches."""
+        self._snapshot_pages.discard(page)
+        target_id = self._target_by_page.pop(page, None)
+        if target_id is not None:
+            self._page_by_target.pop(target_id, None)
+        for name in [n for n, p in self._page_by_name.items() if p is page]:
+            del self._page_by_name[name]
 
     async def list_pages(self) -> list[str]:
         """List all named pages on the server."""
-        response = await self._http_client.get(f"{self.server_url}/pages")
+        response = await self._http_client.get(self._url_pages, timeout=self.timeout)
         response.raise_for_status()
         return response.json()["pages"]
 
     async def close_page(self, name: str) -> None:
         """Close a named page on the server."""
+        self.invalidate_snapshot(name)
+        page = self._page_by_name.pop(name, None)
+        if page is not None:
+            self._forget_page(page)
+
         response = await self._http_client.delete(
-            f"{self.server_url}/pages/{name}"
+            f"{self.server_url}/pages/{name}", timeout=self.timeout
         )
         response.raise_for_status()
 
@@ -313,6 +716,7 @@ class DevBrowserClient:
         success = await self._auth_manager.ensure_logged_in(
             page, site_name, navigate_to
         )
+        self.invalidate_snapshot(page_name)
 
         if not success:
             raise RuntimeError(
@@ -339,7 +743,9 @@ class DevBrowserClient:
             return False
 
         page = await self.get_page(page_name)
-        return await self._auth_manager.ensure_logged_in(page, site_name)
+        logged_in = await self._auth_manager.ensure_logged_in(page, site_name)
+        self.invalidate_snapshot(page_name)
+        return logged_in
 
     async def is_logged_out(self, page_name: str, site_name: str) -> bool:
         """
@@ -374,7 +780,7 @@ class DevBrowserClient:
         """Get the auth manager instance for advanced usage."""
         return self._auth_manager
 
-    async def get_ai_snapshot(self, name: str) -> str:
+    async def get_ai_snapshot(self, name: str, cache_ttl: float = 0.0) -> str:
         """
         Get an LLM-friendly ARIA snapshot of a page.
 
@@ -383,225 +789,84 @@ class DevBrowserClient:
 
         Args:
             name: Name of the page
+            cache_ttl: Reuse a snapshot of the same page and URL taken within
+                this many seconds (0 always takes a fresh one)
 
         Returns:
             YAML string representing the page structure
         """
         page = await self.get_page(name)
 
-        # Read and inject the snapshot script
-        snapshot_script = self._get_snapshot_script()
+        key = (name, page.url)
+        if cache_ttl > 0:
+            cached = self._snapshot_cache.get(key)
+            if cached is not None and time.monotonic() - cached[0] < cache_ttl:
+                self._snapshot_cache.move_to_end(key)
+                return cached[1]
+
+        # Only send the generator when this document doesn't have it yet
+        snapshot = await page.evaluate(_SNAPSHOT_CALL)
+        if snapshot is None:
+            snapshot = await page.evaluate(_SNAPSHOT_INJECT, _SNAPSHOT_SCRIPT)
 
-        snapshot = await page.evaluate(f"""
-            (script) => {{
-                if (!window.__devBrowser_getAISnapshot) {{
-                    eval(script);
-                }}
-                return window.__devBrowser_getAISnapshot();
-            }}
-        """, snapshot_script)
+        self._snapshot_cache[key] = (time.monotonic(), snapshot)
+        self._snapshot_cache.move_to_end(key)
+        if len(self._snapshot_cache) > SNAPSHOT_CACHE_SIZE:
+            self._snapshot_cache.popitem(last=False)
 
         return snapshot
 
-    async def select_ref(self, page_name: str, ref: str):
+    def invalidate_snapshot(self, page_name: str) -> None:
+        """Drop cached snapshots of a page, e.g. after its state changed."""
+        for key in [k for k in self._snapshot_cache if k[0] == page_name]:
+            del self._snapshot_cache[key]
+
+    async def refresh_refs(self, name: str) -> int:
         """
-        Get an element handle by its ref from the last snapshot.
+        Re-run the snapshot in the page without transferring its YAML.
 
-        Refs are stored on the page and persist across reconnections.
+        Use this before select_ref when the structure text isn't needed;
+        the YAML stays in the page for get_last_snapshot().
 
         Args:
-            page_name: Name of the page
-            ref: Element ref (e.g., "e1", "e5")
+            name: Name of the page
 
         Returns:
-            Playwright ElementHandle
+            Number of refs in the new snapshot
         """
-        page = await self.get_page(page_name)
-
-        element_handle = await page.evaluate_handle(f"""
-            (refId) => {{
-                const refs = window.__devBrowserRefs;
-                if (!refs) {{
-                    throw new Error("No snapshot refs found. Call get_ai_snapshot first.");
-                }}
-                const element = refs[refId];
-                if (!element) {{
-                    throw new Error(`Ref "${{refId}}" not found. Available refs: ${{Object.keys(refs).join(", ")}}`);
-                }}
-                return element;
-            }}
-        """, ref)
-
-        return element_handle.as_element()
-
-    def _get_snapshot_script(self) -> str:
-        """Read the snapshot script from the TypeScript source."""
-        # The snapshot script is inlined in browser-script.ts
-        # For simplicity, we include a Python version here
-        snapshot_path = Path(__file__).parent / "src" / "snapshot" / "browser-script.ts"
-
-        if snapshot_path.exists():
-            # Extract the script string from the TypeScript file
-            # This is a simplified approach - in production you might compile the TS
-            content = snapshot_path.read_text()
+        page = await self.get_page(name)
 
-            # Find the cachedScript assignment and extract it
-            # For now, return the embedded script directly from the TS source
-            return self._extract_snapshot_script()
+        count = await page.evaluate(_REFRESH_REFS_CALL)
+        if count is None:
+            await page.evaluate(_SNAPSHOT_INSTALL, _SNAPSHOT_SCRIPT)
+            count = await page.evaluate(_REFRESH_REFS_CALL)
 
-        return self._extract_snapshot_script()
+        self.invalidate_snapshot(name)
+        return count
 
-    def _extract_snapshot_script(self) -> str:
-        """
-        Return the snapshot script.
+    async def get_last_snapshot(self, name: str) -> Optional[str]:
+        """Fetch the YAML of the page's most recent snapshot, if any."""
+        page = await self.get_page(name)
+        return await page.evaluate(_LAST_SNAPSHOT_CALL)
 
-        This is the bundled version of the ARIA snapshot generator that can be
-        injected into the browser. It provides:
-        - getAISnapshot(): Returns YAML representation of page structure
-        - selectSnapshotRef(ref): Get element by ref
-        - window.__devBrowserRefs: Map of ref -> element
+    async def select_ref(self, page_name: str, ref: str):
         """
-        # This is a condensed version of the snapshot script from browser-script.ts
-        # The full script is quite long, so we load it dynamically from the TS source
-        # when available, or use this fallback
-        return """
-(function() {
-  if (window.__devBrowser_getAISnapshot) return;
-
-  // Simplified ARIA snapshot implementation
-  let cacheStyle;
-  let cachesCounter = 0;
-
-  function beginDOMCaches() { ++cachesCounter; cacheStyle = cacheStyle || new Map(); }
-  function endDOMCaches() { if (!--cachesCounter) cacheStyle = undefined; }
-
-  function getElementComputedStyle(element, pseudo) {
-    const cache = cacheStyle;
-    const cacheKey = pseudo ? undefined : element;
-    if (cache && cacheKey && cache.has(cacheKey)) return cache.get(cacheKey);
-    const style = element.ownerDocument?.defaultView?.getComputedStyle(element, pseudo);
-    if (cache && cacheKey) cache.set(cacheKey, style);
-    return style;
-  }
-
-  function isElementVisible(element) {
-    const style = getElementComputedStyle(element);
-    if (!style || style.display === 'none' || style.visibility === 'hidden') return false;
-    const rect = element.getBoundingClientRect();
-    return rect.width > 0 && rect.height > 0;
-  }
-
-  function getAriaRole(element) {
-    const explicit = element.getAttribute('role');
-    if (explicit) return explicit;
-
-    const tagRoles = {
-      A: (e) => e.hasAttribute('href') ? 'link' : null,
-      BUTTON: () => 'button',
-      INPUT: (e) => {
-        const type = e.type?.toLowerCase() || 'text';
-        const roles = { button: 'button', checkbox: 'checkbox', radio: 'radio', submit: 'button', reset: 'button' };
-        return roles[type] || 'textbox';
-      },
-      SELECT: () => 'combobox',
-      TEXTAREA: () => 'textbox',
-      IMG: () => 'img',
-      H1: () => 'heading', H2: () => 'heading', H3: () => 'heading',
-      H4: () => 'heading', H5: () => 'heading', H6: () => 'heading',
-      UL: () => 'list', OL: () => 'list', LI: () => 'listitem',
-      NAV: () => 'navigation', MAIN: () => 'main', HEADER: () => 'banner',
-      FOOTER: () => 'contentinfo', ARTICLE: () => 'article', SECTION: () => 'region',
-    };
-
-    const fn = tagRoles[element.tagName];
-    return fn ? fn(element) : null;
-  }
-
-  function getAccessibleName(element) {
-    const ariaLabel = element.getAttribute('aria-label');
-    if (ariaLabel) return ariaLabel.trim();
-
-    const labelledBy = element.getAttribute('aria-labelledby');
-    if (labelledBy) {
-      const labels = labelledBy.split(' ').map(id => document.getElementById(id)?.textContent || '').join(' ');
-      if (labels.trim()) return labels.trim();
-    }
-
-    if (element.tagName === 'IMG') return element.getAttribute('alt') || '';
-    if (element.tagName === 'INPUT' || element.tagName === 'TEXTAREA') {
-      const label = document.querySelector(`label[for="${element.id}"]`);
-      if (label) return label.textContent?.trim() || '';
-      return element.placeholder || '';
-    }
-
-    return element.textContent?.trim().slice(0, 100) || '';
-  }
-
-  let refCounter = 0;
-
-  function generateSnapshot(root) {
-    const elements = new Map();
-    const lines = [];
-
-    function visit(element, indent) {
-      if (!element || element.nodeType !== 1) return;
-      if (!isElementVisible(element)) return;
-
-      const role = getAriaRole(element);
-      const name = getAccessibleName(element);
-
-      // Skip generic/uninteresting elements
-      if (!role && !name && element.children.length <= 1) {
-        for (const child of element.children) visit(child, indent);
-        return;
-      }
-
-      const ref = 'e' + (++refCounter);
-      elements.set(ref, element);
-
-      let line = indent + '- ';
-      if (role) line += role;
-      if (name) line += ' "' + name.replace(/"/g, '\\\\"').slice(0, 50) + '"';
-      line += ' [ref=' + ref + ']';
-
-      // Add state attributes
-      if (element.disabled) line += ' [disabled]';
-      if (element.checked) line += ' [checked]';
-      if (element.getAttribute('aria-expanded') === 'true') line += ' [expanded]';
-
-      lines.push(line);
+        Get an element handle by its ref from the last snapshot.
 
-      for (const child of element.children) {
-        visit(child, indent + '  ');
-      }
-    }
+        Refs are stored on the page and persist across reconnections.
 
-    beginDOMCaches();
-    try {
-      visit(root, '');
-    } finally {
-      endDOMCaches();
-    }
+        Args:
+            page_name: Name of the page
+            ref: Element ref (e.g., "e1", "e5")
 
-    return { yaml: lines.join('\\n'), elements };
-  }
+        Returns:
+            Playwright ElementHandle
+        """
+        page = await self.get_page(page_name)
 
-  window.__devBrowser_getAISnapshot = function() {
-    refCounter = 0;
-    const snapshot = generateSnapshot(document.body);
-    window.__devBrowserRefs = Object.fromEntries(snapshot.elements);
-    return snapshot.yaml;
-  };
+        element_handle = await page.evaluate_handle(_SELECT_REF, ref)
 
-  window.__devBrowser_selectSnapshotRef = function(ref) {
-    const refs = window.__devBrowserRefs;
-    if (!refs) throw new Error('No snapshot refs found. Call getAISnapshot first.');
-    const element = refs[ref];
-    if (!element) throw new Error('Ref "' + ref + '" not found.');
-    return element;
-  };
-})();
-"""
+        return element_handle.as_element()
 
 
 # Convenience functions for common operations
@@ -609,7 +874,8 @@ async def navigate(page_name: str, url: str, server_url: str = "http://localhost
     """
     Navigate a page to a URL and return the AI snapshot.
 
-    Quick one-shot function for simple automation tasks.
+    Quick one-shot function for simple automation tasks. Closes the
+    shared HTTP client when done, like run_once().
 
     Args:
         page_name: Name for the page
@@ -619,11 +885,14 @@ async def navigate(page_name: str, url: str, server_url: str = "http://localhost
     Returns:
         AI snapshot of the page after navigation
     """
-    async with DevBrowserClient(server_url=server_url) as client:
-        page = await client.get_page(page_name)
-        await page.goto(url)
-        await page.wait_for_load_state("networkidle")
-        return await client.get_ai_snapshot(page_name)
+    try:
+        async with DevBrowserClient(server_url=server_url) as client:
+            page = await client.get_page(page_name)
+            await page.goto(url)
+            await page.wait_for_load_state("networkidle")
+            return await client.get_ai_snapshot(page_name)
+    finally:
+        await shutdown_module()
 
 
 async def take_screenshot(
@@ -633,7 +902,8 @@ async def take_screenshot(
     server_url: str = "http://localhost:9222"
 ) -> str:
     """
-    Take a screenshot of a page.
+    Take a screenshot of a page. Closes the shared HTTP client when done,
+    like run_once().
 
     Args:
         page_name: Name for the page
@@ -644,18 +914,132 @@ async def take_screenshot(
     Returns:
         Path to the saved screenshot
     """
-    async with DevBrowserClient(server_url=server_url) as client:
-        page = await client.get_page(page_name)
+    try:
+        async with DevBrowserClient(server_url=server_url) as client:
+            page = await client.get_page(page_name)
 
-        if url:
-            await page.goto(url)
-            await page.wait_for_load_state("networkidle")
+            if url:
+                await page.goto(url)
+                await page.wait_for_load_state("networkidle")
 
-        await page.screenshot(path=output_path, full_page=True)
-        return output_path
+            await page.screenshot(path=output_path, full_page=True)
+            return output_path
+    finally:
+        await shutdown_module()
+
+
+async def run_action(client: DevBrowserClient, action: str, params: dict) -> dict:
+    """
+    Run a single bridge action against the CLI page.
+
+    Args:
+        client: Connected Dev Browser client
+        action: One of navigate, click, type, screenshot, aria_snapshot, state
+        params: Action parameters (url, selector, text, path)
+
+    Returns:
+        Dict with url, title and action-specific fields
+    """
+    page = await client.get_page(CLI_PAGE_NAME)
+    result = {}
+
+    if action == "navigate":
+        await page.goto(params["url"])
+    elif action == "click":
+        await page.click(params["selector"])
+    elif action == "type":
+        await page.fill(params["selector"], params.get("text", ""))
+    elif action == "screenshot":
+        path = params.get("path") or ".tmp/screenshot.png"
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        await page.screenshot(path=path, full_page=True)
+        result["screenshot_path"] = path
+    elif action == "aria_snapshot":
+        result["aria_snapshot"] = await client.get_ai_snapshot(CLI_PAGE_NAME)
+    elif action != "state":
+        raise ValueError(f"Unknown action: {action}")
+
+    result["url"] = page.url
+    result["title"] = await page.title()
+    return result
+
+
+async def serve_stdio(server_url: str = "http://localhost:9222") -> None:
+    """
+    Serve actions as JSON lines over stdin/stdout until stdin closes.
+
+    Each request line is {"action": ..., "params": {...}} and gets exactly
+    one response line, either the action result or {"error": ...}. This
+    keeps one interpreter and browser connection alive across actions.
+    """
+    loop = asyncio.get_running_loop()
+
+    try:
+        async with DevBrowserClient(server_url=server_url) as client:
+            while True:
+                line = await loop.run_in_executor(None, sys.stdin.readline)
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                    response = await run_action(
+                        client, request["action"], request.get("params", {})
+                    )
+                except Exception as e:
+                    response = {"error": str(e)}
+
+                sys.stdout.write(json.dumps(response) + "\n")
+                sys.stdout.flush()
+    finally:
+        await shutdown_module()
+
+
+async def run_once(action: str, params: dict, server_url: str = "http://localhost:9222") -> dict:
+    """Connect, run a single action and disconnect."""
+    try:
+        async with DevBrowserClient(server_url=server_url) as client:
+            return await run_action(client, action, params)
+    finally:
+        await shutdown_module()
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Dev Browser client")
+    parser.add_argument("action", nargs="?", help="Action to run (omit for a quick test)")
+    parser.add_argument("--daemon", action="store_true",
+                        help="Serve JSON-line actions on stdin/stdout")
+    parser.add_argument("--server-url", default="http://localhost:9222")
+    parser.add_argument("--url")
+    parser.add_argument("--selector")
+    parser.add_argument("--text")
+    parser.add_argument("--path")
+    args = parser.parse_args()
+
+    if args.daemon:
+        asyncio.run(serve_stdio(args.server_url))
+        sys.exit(0)
+
+    if args.action:
+        params = {
+            key: value
+            for key, value in (
+                ("url", args.url),
+                ("selector", args.selector),
+                ("text", args.text),
+                ("path", args.path),
+            )
+            if value is not None
+        }
+        try:
+            print(json.dumps(asyncio.run(run_once(args.action, params, args.server_url))))
+        except Exception as e:
+            print(str(e), file=sys.stderr)
+            sys.exit(1)
+        sys.exit(0)
+
     # Quick test
     async def main():
         async with DevBrowserClient(auto_start=False) as client:
@@ -165,7 +165,12 @@ export async function serve(options: ServeOptions = {}): Promise<DevBrowserServe
       });
     }
 
-    const response: GetPageResponse = { wsEndpoint, name, targetId: entry.targetId };
+    const response: GetPageResponse = {
+      wsEndpoint,
+      name,
+      targetId: entry.targetId,
+      url: entry.page.url(),
+    };
     res.json(response);
   });
 
@@ -16,6 +16,7 @@ export interface GetPageResponse {
   wsEndpoint: string;
   name: string;
   targetId: string; // CDP target ID for reliable page matching
+  url?: string; // Current page URL, lets clients narrow the target match
 }
 
 export interface ListPagesResponse {
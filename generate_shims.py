@@ -8,7 +8,10 @@ visible in the IDE's autocomplete menu.
 """
 
 import os
+import json
 import shutil
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from loader import BridgeLoader
 
@@ -16,6 +19,69 @@ OPENCODE_COMMANDS_DIR = Path.home() / ".config/opencode/commands"
 # Or local project .agent/commands if you prefer project-local shims
 # OPENCODE_COMMANDS_DIR = Path(".agent/commands")
 
+# Upper bound on concurrent shim writes
+MAX_WRITE_WORKERS = 8
+
+# shim path -> [source path, mtime_ns, size] of the command it was built
+# from, followed by [mtime_ns, size] of the shim as written. Kept in a
+# cache/ directory beside the shim output directory
+SHIMS_MANIFEST_NAME = "shims_manifest.json"
+
+
+def _manifest_path(output_dir: Path) -> Path:
+    """Where the manifest for shims written to output_dir lives."""
+    return Path(output_dir).parent / "cache" / SHIMS_MANIFEST_NAME
+
+
+def _file_stamp(path) -> list:
+    """[mtime_ns, size] of a file, or None if it cannot be stat'ed."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _read_if_size(path: str, size: int):
+    """Return a file's bytes if it exists with exactly `size` bytes, else None."""
+    try:
+        if os.stat(path).st_size != size:
+            return None
+        with open(path, "rb") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def _write_shim(path: str, content: bytes) -> bool:
+    """Write a shim unless it is already up to date; True if written."""
+    if _read_if_size(path, len(content)) == content:
+        return False
+    
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, content)
+    finally:
+        os.close(fd)
+    return True
+
+
+def _load_manifest(path: Path) -> dict:
+    """Read the shim manifest from the last run ({} if missing or corrupt)."""
+    try:
+        with open(path, "rb") as f:
+            manifest = json.load(f)
+        return manifest if isinstance(manifest, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path: Path, manifest: dict) -> None:
+    """Persist the shim manifest for the next run."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(manifest, indent=2))
+
+
 def generate_shims():
     """Generate shims for all loaded commands."""
     loader = BridgeLoader()
@@ -38,11 +104,31 @@ def generate_shims():
         
     print(f"Generating shims in {params['output_dir']}...")
     
-    count = 0
+    manifest_path = _manifest_path(params["output_dir"])
+    manifest = _load_manifest(manifest_path)
+    new_manifest = {}
+    skipped = 0
+    
+    shims = []
     for name, cmd in registry.commands.items():
         # Sanitize name for filename (replace : with _)
         safe_name = name.replace(":", "_")
-        shim_path = params["output_dir"] / f"{safe_name}.md"
+        shim_path = os.path.join(params["output_dir"], f"{safe_name}.md")
+        
+        # A shim built from an unchanged source file is still current,
+        # unless the shim itself was changed since it was written
+        source_stamp = _file_stamp(cmd.path)
+        stamp = [str(cmd.path)] + source_stamp if source_stamp is not None else None
+        previous = manifest.get(shim_path)
+        if (
+            stamp is not None
+            and isinstance(previous, list)
+            and previous[:3] == stamp
+            and previous[3:] == _file_stamp(shim_path)
+        ):
+            new_manifest[shim_path] = previous
+            skipped += 1
+            continue
         
         # Create argument placeholder
         arg_str = "$ARGUMENTS" if "ARGUMENTS" in cmd.content else ""
@@ -54,13 +140,39 @@ def generate_shims():
 description: {desc} (Bridge)
 ---
 @cc2oc-bridge run {name} {arg_str}
-"""
-        shim_path.write_text(shim_content)
-        count += 1
-        print(f"  + Created /{safe_name} -> {name}")
+""".encode()
+        shims.append((name, safe_name, shim_path, shim_content, stamp))
+    
+    # Writes are independent, so overlap them on a small pool
+    if len(shims) > 1:
+        with ThreadPoolExecutor(max_workers=min(MAX_WRITE_WORKERS, len(shims))) as pool:
+            written = list(pool.map(lambda shim: _write_shim(shim[2], shim[3]), shims))
+    else:
+        written = [_write_shim(shim[2], shim[3]) for shim in shims]
+    
+    count = len(registry.commands)
+    unchanged = skipped
+    # Report in one write rather than a print (and flush, off a tty) per shim
+    out_lines = []
+    for (name, safe_name, shim_path, _, stamp), was_written in zip(shims, written):
+        shim_stamp = _file_stamp(shim_path)
+        if stamp is not None and shim_stamp is not None:
+            new_manifest[shim_path] = stamp + shim_stamp
+        else:
+            new_manifest[shim_path] = None
+        if was_written:
+            out_lines.append(f"  + Created /{safe_name} -> {name}\n")
+        else:
+            unchanged += 1
         
-    print(f"\nGenerated {count} command shims.")
-    print(f"Refreshed OpenCode to see them.")
+    if unchanged:
+        out_lines.append(f"  ({unchanged} unchanged)\n")
+    if new_manifest != manifest:
+        _save_manifest(manifest_path, new_manifest)
+    out_lines.append(f"\nGenerated {count} command shims.\n")
+    out_lines.append("Refreshed OpenCode to see them.\n")
+    sys.stdout.write("".join(out_lines))
+    sys.stdout.flush()
 
 if __name__ == "__main__":
     generate_shims()
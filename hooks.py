@@ -14,11 +14,172 @@ Executes Claude Code lifecycle hooks with full v2.1.x compatibility:
 import os
 import re
 import json
+import heapq
+import mmap
+import shlex
+import signal
+import selectors
+import threading
+import sys
+import time
 import subprocess
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from operator import attrgetter
 from pathlib import Path
 from dataclasses import dataclass, field
-from typing import Dict, List, Any, Optional, Callable
-from enum import Enum
+from typing import Dict, List, Any, Optional, Callable, Iterable, Pattern, FrozenSet, Tuple, Union
+from functools import lru_cache
+from enum import Enum, IntEnum
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# hooks.json files at least this large are parsed straight from an mmap
+MMAP_THRESHOLD = 64 * 1024
+
+# Per-call contexts and hook configs are allocated often; use __slots__
+# where dataclasses support it (Python 3.10+).
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Matches nothing; stands in for matchers that are not valid regexes.
+_NEVER_MATCH = re.compile(r"(?!)")
+
+
+# Variables exported to command hooks and substituted into templates.
+_ENV_VARS = (
+    "TOOL_NAME", "TOOL_INPUT", "TOOL_OUTPUT", "SESSION_ID",
+    "AGENT_NAME", "CLAUDE_PLUGIN_ROOT", "PROJECT_ROOT",
+)
+_VAR_NAMES = "|".join(_ENV_VARS)
+# ${NAME} or $NAME for each of the above.
+_VAR_RE = re.compile(r"\$(?:\{(%s)\}|(%s))" % (_VAR_NAMES, _VAR_NAMES))
+
+# HookContext attribute behind each plain-string variable
+_CONTEXT_ATTRS = {
+    "TOOL_NAME": "tool_name",
+    "TOOL_OUTPUT": "tool_output",
+    "SESSION_ID": "session_id",
+    "AGENT_NAME": "agent_name",
+    "CLAUDE_PLUGIN_ROOT": "plugin_root",
+}
+
+
+def _escape_braces(text: str) -> str:
+    return text.replace("{", "{{").replace("}", "}}")
+
+
+@lru_cache(maxsize=256)
+def _format_template(template: str) -> Optional[str]:
+    """
+    Rewrite ${VAR}/$VAR references as str.format fields, escaping any other
+    braces, so substitution is a single format_map call.
+    
+    Returns None when the template references no variables.
+    """
+    parts = []
+    pos = 0
+    for match in _VAR_RE.finditer(template):
+        parts.append(_escape_braces(template[pos:match.start()]))
+        parts.append("{%s}" % (match.group(1) or match.group(2)))
+        pos = match.end()
+    if not parts:
+        return None
+    parts.append(_escape_braces(template[pos:]))
+    return "".join(parts)
+
+
+# Matchers made only of tool names joined by "|" (e.g. "Write|Edit").
+_LITERAL_MATCHER_RE = re.compile(r"[A-Za-z0-9_]+(?:\|[A-Za-z0-9_]+)*")
+
+
+def _literal_names(matcher: str) -> Optional[FrozenSet[str]]:
+    """Return the lowercased tool names of a literal matcher, else None."""
+    if not _LITERAL_MATCHER_RE.fullmatch(matcher):
+        return None
+    return frozenset(matcher.lower().split("|"))
+
+
+# Characters that need /bin/sh to interpret a hook command.
+_SHELL_META_RE = re.compile(r"[|&;<>()$`*?\[\]{}~#!\\\n]")
+
+# Block signal in prompt/agent hook output; searched in place rather than
+# upper-casing a copy of the whole response
+_BLOCK_RE = re.compile(r"block", re.IGNORECASE)
+
+# Commands that already send their stdout to /dev/null
+_DEVNULL_STDOUT_RE = re.compile(r"(?<![0-9&])>\s*/dev/null\s*$")
+
+# Command separators; with one before the trailing redirect, the redirect
+# only covers the last command
+_COMMAND_SEPARATOR_RE = re.compile(r"[;&|\n]")
+
+
+def _discards_stdout(command: Optional[str]) -> bool:
+    """True for a single command whose stdout already goes to /dev/null."""
+    if not command:
+        return False
+    match = _DEVNULL_STDOUT_RE.search(command)
+    return match is not None and not _COMMAND_SEPARATOR_RE.search(command, 0, match.start())
+
+# Builtins with no standalone executable (or one that behaves differently).
+_SHELL_BUILTINS = frozenset({
+    ".", ":", "alias", "cd", "eval", "exec", "exit", "export", "read",
+    "return", "set", "shift", "source", "trap", "ulimit", "umask", "unset", "wait",
+})
+
+
+def _command_argv(command: Optional[str]) -> Optional[List[str]]:
+    """Split a command that can be exec'd without a shell, else return None."""
+    if not command or _SHELL_META_RE.search(command):
+        return None
+    try:
+        argv = shlex.split(command)
+    except ValueError:
+        return None
+    if not argv or "=" in argv[0] or argv[0] in _SHELL_BUILTINS:
+        return None
+    return argv
+
+
+def _decode_output(data: bytes) -> str:
+    """Decode captured hook output for display, only once it is actually shown."""
+    return data.decode(errors="replace").strip()
+
+
+def _load_json_file(path: Path, object_hook: Optional[Callable[[Dict], Any]] = None) -> Any:
+    """
+    Parse a JSON file from its raw bytes.
+    
+    With orjson, large files are parsed in place from an mmap; orjson has no
+    object_hook, so it is only applied by the stdlib fallback.
+    """
+    with open(path, "rb") as f:
+        if orjson is None:
+            return json.loads(f.read(), object_hook=object_hook)
+        if os.fstat(f.fileno()).st_size >= MMAP_THRESHOLD:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with memoryview(mapped) as view:
+                    return orjson.loads(view)
+        return orjson.loads(f.read())
+
+
+# matcher -> (compiled pattern, literal tool names), shared by every hook
+# with that matcher for the life of the process
+_MATCHER_CACHE: Dict[str, Tuple[Pattern, Optional[FrozenSet[str]]]] = {}
+
+
+def _intern_matcher(matcher: str) -> Tuple[Pattern, Optional[FrozenSet[str]]]:
+    """Compile a hook matcher once per process; invalid patterns never match."""
+    cached = _MATCHER_CACHE.get(matcher)
+    if cached is None:
+        try:
+            pattern = re.compile(matcher, re.IGNORECASE)
+        except re.error:
+            pattern = _NEVER_MATCH
+        cached = _MATCHER_CACHE.setdefault(matcher, (pattern, _literal_names(matcher)))
+    return cached
 
 
 class HookType(Enum):
@@ -33,13 +194,35 @@ class HookType(Enum):
     PERMISSIONREQUEST = "PermissionRequest"
 
 
-class HookResult(Enum):
+# One bit per event, for HookEngine's registered-event mask
+_HOOK_BITS = {hook_type: 1 << index for index, hook_type in enumerate(HookType)}
+
+# Events whose hooks are independent of each other and may run concurrently.
+# PreToolUse and PermissionRequest stay serial so the first BLOCK wins in order.
+PARALLEL_HOOK_TYPES = frozenset({
+    HookType.POSTTOOLUSE,
+    HookType.SESSIONSTART,
+    HookType.SESSIONEND,
+    HookType.SUBAGENTSTART,
+    HookType.SUBAGENTSTOP,
+})
+
+# Upper bound on hooks run concurrently for one event
+MAX_HOOK_WORKERS = 8
+
+
+class HookResult(IntEnum):
+    # Ordered by severity, so the worst result so far is a max()
     CONTINUE = 0  # Success, continue execution
     ERROR = 1     # Error, log and continue
     BLOCK = 2     # Block the tool from running
+    
+    # Keep printing as HookResult.NAME rather than the bare int
+    __str__ = Enum.__str__
+    __format__ = Enum.__format__
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class HookContext:
     """Context passed to hook execution."""
     hook_type: HookType
@@ -51,9 +234,25 @@ class HookContext:
     agent_name: str = ""
     plugin_root: str = ""
     project_root: str = ""
+    _tool_input_json: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _project_root_str: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    @property
+    def tool_input_json(self) -> str:
+        """tool_input serialized as JSON, computed on first use."""
+        if self._tool_input_json is None:
+            self._tool_input_json = json.dumps(self.tool_input)
+        return self._tool_input_json
+    
+    @property
+    def project_root_str(self) -> str:
+        """project_root as a string ("" when unset), computed on first use."""
+        if self._project_root_str is None:
+            self._project_root_str = str(self.project_root) if self.project_root else ""
+        return self._project_root_str
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class HookConfig:
     """Configuration for a single hook."""
     type: str  # "command", "prompt", or "agent"
@@ -63,6 +262,150 @@ class HookConfig:
     agent: Optional[str] = None
     timeout: int = 600  # v2.1.x: 10 minutes
     once: bool = False  # v2.1.x: run only once per session
+    silent: bool = False  # stdout is never shown; don't capture it
+    _matcher_re: Pattern = field(init=False, repr=False, compare=False)
+    _literal_set: Optional[FrozenSet[str]] = field(init=False, repr=False, compare=False)
+    _command_fmt: Optional[str] = field(init=False, repr=False, compare=False)
+    _prompt_fmt: Optional[str] = field(init=False, repr=False, compare=False)
+    _hook_id: str = field(init=False, default="", repr=False, compare=False)
+    _argv: Optional[List[str]] = field(init=False, repr=False, compare=False)
+    _discard_stdout: bool = field(init=False, repr=False, compare=False)
+    _ran: bool = field(init=False, default=False, repr=False, compare=False)
+    _seq: int = field(init=False, default=0, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._matcher_re, self._literal_set = _intern_matcher(self.matcher)
+        self._command_fmt = _format_template(self.command) if self.command and "$" in self.command else None
+        self._prompt_fmt = _format_template(self.prompt) if self.prompt and "$" in self.prompt else None
+        self._argv = _command_argv(self.command)
+        self._discard_stdout = self.silent or _discards_stdout(self.command)
+
+
+_HOOK_KINDS = ("command", "prompt", "agent")
+
+
+def _hook_from_dict(hook_dict: Dict[str, Any]) -> HookConfig:
+    """Build a HookConfig from one hooks.json entry."""
+    return HookConfig(
+        type=hook_dict.get("type", "command"),
+        matcher=hook_dict.get("matcher", ".*"),
+        command=hook_dict.get("command"),
+        prompt=hook_dict.get("prompt"),
+        agent=hook_dict.get("agent"),
+        timeout=hook_dict.get("timeout", 600),
+        once=hook_dict.get("once", False),
+        silent=hook_dict.get("silent", False)
+    )
+
+
+def _hook_object_hook(obj: Dict[str, Any]) -> Any:
+    """json object_hook that turns hook entries into HookConfigs as they are parsed."""
+    if obj.get("type") in _HOOK_KINDS and ("command" in obj or "prompt" in obj or "agent" in obj):
+        return _hook_from_dict(obj)
+    return obj
+
+
+class _HookVariables:
+    """Template variable mapping for str.format_map, resolved from a context on lookup."""
+    
+    __slots__ = ("context", "project_root")
+    
+    def __init__(self, context: HookContext, project_root: str):
+        self.context = context
+        self.project_root = project_root
+    
+    def __getitem__(self, name: str) -> str:
+        if name == "TOOL_INPUT":
+            return self.context.tool_input_json
+        if name == "PROJECT_ROOT":
+            return self.context.project_root_str or self.project_root
+        return getattr(self.context, _CONTEXT_ATTRS[name])
+
+
+class PersistentShell:
+    """
+    A long-lived /bin/sh that runs hook commands in subshells.
+    
+    Each command runs as `( exports; eval cmd ) </dev/null`, so hooks cannot
+    leak state into each other, and a per-shell sentinel marks the end of
+    its stdout/stderr and carries the exit status.
+    """
+    
+    def __init__(self, cwd: str, env: Dict[str, str]):
+        self.lock = threading.Lock()
+        self._marker = b"\n__HOOK_DONE_" + os.urandom(8).hex().encode() + b"__"
+        self._proc = subprocess.Popen(
+            ["/bin/sh"],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            cwd=cwd,
+            env=env,
+            bufsize=0,
+            start_new_session=True,
+        )
+    
+    @property
+    def alive(self) -> bool:
+        return self._proc.poll() is None
+    
+    def run(
+        self,
+        command: str,
+        variables: Dict[str, str],
+        timeout: float,
+        discard_stdout: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """Run one command, raising subprocess.TimeoutExpired like subprocess.run."""
+        token = self._marker[1:].decode()
+        exports = "".join(f"export {name}={shlex.quote(value)}; " for name, value in variables.items())
+        redirect = " >/dev/null" if discard_stdout else ""
+        script = (
+            f"( {exports}eval {shlex.quote(command)} ) </dev/null{redirect}\n"
+            f"printf '\\n%s %d\\n' {token} $?\n"
+            f"printf '\\n%s\\n' {token} >&2\n"
+        )
+        self._proc.stdin.write(script.encode())
+        
+        buffers = {self._proc.stdout.fileno(): bytearray(), self._proc.stderr.fileno(): bytearray()}
+        deadline = time.monotonic() + timeout
+        with selectors.DefaultSelector() as selector:
+            for fd in buffers:
+                selector.register(fd, selectors.EVENT_READ)
+            pending = len(buffers)
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.close()
+                    raise subprocess.TimeoutExpired(command, timeout)
+                for key, _ in selector.select(remaining):
+                    chunk = os.read(key.fd, 65536)
+                    if not chunk:
+                        self.close()
+                        raise RuntimeError("hook shell exited unexpectedly")
+                    buffer = buffers[key.fd]
+                    buffer += chunk
+                    if self._marker in buffer and buffer.endswith(b"\n"):
+                        selector.unregister(key.fd)
+                        pending -= 1
+        
+        stdout, status = buffers[self._proc.stdout.fileno()].split(self._marker, 1)
+        stderr = buffers[self._proc.stderr.fileno()].split(self._marker, 1)[0]
+        return subprocess.CompletedProcess(
+            command,
+            int(status),
+            bytes(stdout),
+            bytes(stderr),
+        )
+    
+    def close(self):
+        """Kill the shell and anything it is still running."""
+        if self.alive:
+            try:
+                os.killpg(self._proc.pid, signal.SIGKILL)
+            except OSError:
+                pass
+        self._proc.wait()
 
 
 class HookEngine:
@@ -70,10 +413,33 @@ class HookEngine:
     
     def __init__(self, project_root: Path = None):
         self.project_root = project_root or Path.cwd()
-        self.hooks: Dict[str, List[HookConfig]] = {}
+        self._project_root_str = str(self.project_root)
+        self.hooks: Dict[HookType, List[HookConfig]] = {}
+        # Literal-matcher hooks indexed by lowercased tool name, and the
+        # remaining regex-matcher hooks, both in registration order.
+        self._dispatch: Dict[HookType, Dict[str, List[HookConfig]]] = {}
+        self._regex_hooks: Dict[HookType, List[HookConfig]] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._type_mask = 0  # _HOOK_BITS of every event with hooks
+        self._shell: Optional[PersistentShell] = None
+        self._shell_lock = threading.Lock()  # guards starting/replacing _shell
         self.executed_once_hooks: set = set()
         self.prompt_executor: Optional[Callable] = None
         self.agent_executor: Optional[Callable] = None
+        # os.environ copied once, with the hook variables of the last
+        # context applied in place
+        self._env_scratch: Optional[Dict[str, str]] = None
+        self._env_values: tuple = (None,) * len(_ENV_VARS)
+    
+    def close(self):
+        """Stop the persistent hook shell and the hook thread pool, if started."""
+        with self._shell_lock:
+            shell, self._shell = self._shell, None
+        if shell is not None:
+            shell.close()
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
     
     def register_prompt_executor(self, executor: Callable[[str, HookContext], str]):
         """Register a function to execute prompt-type hooks."""
@@ -83,23 +449,52 @@ class HookEngine:
         """Register a function to execute agent-type hooks."""
         self.agent_executor = executor
     
-    def load_hooks(self, hooks_data: Dict[str, List[Dict]]):
+    def load_hooks(self, hooks_data: Dict[str, List[Union[Dict, HookConfig]]]):
         """Load hooks from a hooks configuration dictionary."""
-        for hook_type, hook_list in hooks_data.items():
-            if hook_type not in self.hooks:
-                self.hooks[hook_type] = []
+        for type_name, hook_list in hooks_data.items():
+            try:
+                hook_type = HookType(type_name)
+            except ValueError:
+                print(f"Warning: Unknown hook event: {type_name}")
+                continue
             
+            hooks = self.hooks.setdefault(hook_type, [])
+            dispatch = self._dispatch.setdefault(hook_type, {})
+            regex_hooks = self._regex_hooks.setdefault(hook_type, [])
             for hook_dict in hook_list:
-                config = HookConfig(
-                    type=hook_dict.get("type", "command"),
-                    matcher=hook_dict.get("matcher", ".*"),
-                    command=hook_dict.get("command"),
-                    prompt=hook_dict.get("prompt"),
-                    agent=hook_dict.get("agent"),
-                    timeout=hook_dict.get("timeout", 600),
-                    once=hook_dict.get("once", False)
-                )
-                self.hooks[hook_type].append(config)
+                # Entries may already be HookConfigs built during parsing
+                if isinstance(hook_dict, HookConfig):
+                    config = hook_dict
+                else:
+                    config = _hook_from_dict(hook_dict)
+                if config.once:
+                    config._hook_id = f"{hook_type.value}:{config.matcher}:{config.command or config.prompt or config.agent}"
+                config._seq = len(hooks)
+                hooks.append(config)
+                if config._literal_set is not None:
+                    for name in config._literal_set:
+                        dispatch.setdefault(name, []).append(config)
+                else:
+                    regex_hooks.append(config)
+                self._type_mask |= _HOOK_BITS[hook_type]
+    
+    def register_hooks(self, hooks_data: Dict[str, List[Dict]]):
+        """Register hooks from a single source (e.g. one plugin)."""
+        self.load_hooks(hooks_data)
+    
+    def register_hooks_bulk(self, hooks_sources: Iterable[Dict[str, List[Dict]]]):
+        """
+        Register hooks from many sources (e.g. every loaded plugin) at once.
+        
+        The sources are merged per hook type first, so the engine's
+        hook tables are extended once per type rather than once per source.
+        """
+        merged: Dict[str, List[Dict]] = {}
+        for hooks_data in hooks_sources:
+            for hook_type, hook_list in hooks_data.items():
+                if isinstance(hook_list, list):
+                    merged.setdefault(hook_type, []).extend(hook_list)
+        self.load_hooks(merged)
     
     def load_hooks_from_file(self, hooks_file: Path):
         """Load hooks from a hooks.json file."""
@@ -107,7 +502,7 @@ class HookEngine:
             return
         
         try:
-            data = json.loads(hooks_file.read_text(encoding="utf-8"))
+            data = _load_json_file(hooks_file, object_hook=_hook_object_hook)
             hooks_dict = data.get("hooks", data)  # Support both wrapped and unwrapped
             self.load_hooks(hooks_dict)
         except Exception as e:
@@ -119,6 +514,14 @@ class HookEngine:
             return
         self.load_hooks(hooks_data)
     
+    def has_hooks(self, hook_type: HookType) -> bool:
+        """
+        Check whether any hooks are registered for an event.
+        
+        Callers can use this to skip building a HookContext entirely.
+        """
+        return bool(self._type_mask & _HOOK_BITS[hook_type])
+    
     def execute(self, hook_type: HookType, context: HookContext) -> HookResult:
         """
         Execute all hooks for a given type.
@@ -128,20 +531,38 @@ class HookEngine:
             HookResult.BLOCK if any hook blocks
             HookResult.ERROR if any hook errors (but doesn't block)
         """
-        type_str = hook_type.value
-        if type_str not in self.hooks:
+        if not self._type_mask & _HOOK_BITS[hook_type]:
             return HookResult.CONTINUE
+        dispatch = self._dispatch[hook_type]
+        
+        # Literal hooks for this tool already match; regex hooks still need
+        # checking. Merge the two so hooks run in registration order.
+        literal_hooks = dispatch.get(context.tool_name.lower(), ())
+        regex_hooks = self._regex_hooks[hook_type]
+        if not regex_hooks:
+            candidates = literal_hooks
+        elif not literal_hooks:
+            candidates = regex_hooks
+        else:
+            candidates = heapq.merge(literal_hooks, regex_hooks, key=attrgetter("_seq"))
         
         result = HookResult.CONTINUE
+        parallel = hook_type in PARALLEL_HOOK_TYPES
+        pending: List[HookConfig] = []
         
-        for hook in self.hooks[type_str]:
+        for hook in candidates:
             # Check matcher
-            if not self._matches(hook.matcher, context.tool_name):
+            if hook._literal_set is None and not self._matches(hook, context.tool_name):
                 continue
             
             # Check once flag
-            hook_id = f"{type_str}:{hook.matcher}:{hook.command or hook.prompt or hook.agent}"
-            if hook.once and hook_id in self.executed_once_hooks:
+            if hook.once and hook._hook_id in self.executed_once_hooks:
+                continue
+            
+            if parallel:
+                if hook.once:
+                    self.executed_once_hooks.add(hook._hook_id)
+                pending.append(hook)
                 continue
             
             # Execute hook
@@ -149,22 +570,43 @@ class HookEngine:
             
             # Mark as executed if once flag is set
             if hook.once:
-                self.executed_once_hooks.add(hook_id)
+                self.executed_once_hooks.add(hook._hook_id)
             
             # Handle result
             if hook_result == HookResult.BLOCK:
                 return HookResult.BLOCK
-            elif hook_result == HookResult.ERROR:
-                result = HookResult.ERROR
+            if hook_result > result:
+                result = hook_result
         
+        if pending:
+            return self._execute_concurrently(pending, context)
         return result
     
-    def _matches(self, matcher: str, tool_name: str) -> bool:
-        """Check if a tool name matches the hook's matcher regex."""
-        try:
-            return bool(re.match(matcher, tool_name, re.IGNORECASE))
-        except re.error:
-            return False
+    def _execute_concurrently(self, hooks: List[HookConfig], context: HookContext) -> HookResult:
+        """Run independent hooks on the engine's pool, returning early on BLOCK."""
+        if len(hooks) == 1:
+            return self._execute_hook(hooks[0], context)
+        
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=MAX_HOOK_WORKERS)
+        futures = [self._pool.submit(self._execute_hook, hook, context) for hook in hooks]
+        
+        result = HookResult.CONTINUE
+        for future in as_completed(futures):
+            hook_result = future.result()
+            if hook_result == HookResult.BLOCK:
+                for other in futures:
+                    other.cancel()
+                return HookResult.BLOCK
+            if hook_result > result:
+                result = hook_result
+        return result
+    
+    def _matches(self, hook: HookConfig, tool_name: str) -> bool:
+        """Check if a tool name matches the hook's matcher."""
+        if hook._literal_set is not None:
+            return tool_name.lower() in hook._literal_set
+        return bool(hook._matcher_re.match(tool_name))
     
     def _execute_hook(self, hook: HookConfig, context: HookContext) -> HookResult:
         """Execute a single hook."""
@@ -184,40 +626,50 @@ class HookEngine:
             return HookResult.ERROR
         
         # Substitute variables
-        command = self._substitute_variables(hook.command, context)
+        command = hook.command
+        if hook._command_fmt is not None:
+            command = hook._command_fmt.format_map(_HookVariables(context, self._project_root_str))
         
         # Set environment
-        env = os.environ.copy()
-        env["TOOL_NAME"] = context.tool_name
-        env["TOOL_INPUT"] = json.dumps(context.tool_input)
-        env["TOOL_OUTPUT"] = context.tool_output
-        env["SESSION_ID"] = context.session_id
-        env["AGENT_NAME"] = context.agent_name
-        env["CLAUDE_PLUGIN_ROOT"] = context.plugin_root
-        env["PROJECT_ROOT"] = str(context.project_root or self.project_root)
+        env = self._hook_env(context)
         
         try:
-            result = subprocess.run(
-                command,
-                shell=True,
-                cwd=str(self.project_root),
-                env=env,
-                capture_output=True,
-                text=True,
-                timeout=hook.timeout
-            )
+            shell = self._acquire_shell(hook)
+            if shell is not None:
+                try:
+                    result = shell.run(
+                        command,
+                        {name: env[name] for name in _ENV_VARS},
+                        hook.timeout,
+                        discard_stdout=hook._discard_stdout,
+                    )
+                finally:
+                    shell.lock.release()
+            else:
+                # Shell-free commands are exec'd directly, skipping /bin/sh
+                result = subprocess.run(
+                    hook._argv or command,
+                    shell=hook._argv is None,
+                    cwd=self._project_root_str,
+                    env=env,
+                    # Same stdin as the persistent shell's subshells
+                    stdin=subprocess.DEVNULL,
+                    stdout=subprocess.DEVNULL if hook._discard_stdout else subprocess.PIPE,
+                    stderr=subprocess.PIPE,
+                    timeout=hook.timeout
+                )
             
             if result.returncode == 0:
                 if result.stdout:
-                    print(f"[Hook] {result.stdout.strip()}")
+                    print(f"[Hook] {_decode_output(result.stdout)}")
                 return HookResult.CONTINUE
             elif result.returncode == 2:
                 if result.stderr:
-                    print(f"[Hook BLOCKED] {result.stderr.strip()}")
+                    print(f"[Hook BLOCKED] {_decode_output(result.stderr)}")
                 return HookResult.BLOCK
             else:
                 if result.stderr:
-                    print(f"[Hook ERROR] {result.stderr.strip()}")
+                    print(f"[Hook ERROR] {_decode_output(result.stderr)}")
                 return HookResult.ERROR
                 
         except subprocess.TimeoutExpired:
@@ -227,17 +679,64 @@ class HookEngine:
             print(f"[Hook ERROR] {e}")
             return HookResult.ERROR
     
+    def _acquire_shell(self, hook: HookConfig) -> Optional[PersistentShell]:
+        """
+        Return the locked persistent shell for a repeating shell hook, or None.
+        
+        A hook's first run goes through subprocess.run; the shell is only
+        started once a non-once hook fires again, and is skipped while
+        another thread is using it.
+        """
+        if hook.once or hook._argv is not None or os.name != "posix":
+            return None
+        if not hook._ran:
+            hook._ran = True
+            return None
+        
+        with self._shell_lock:
+            shell = self._shell
+            if shell is None or not shell.alive:
+                shell = self._shell = PersistentShell(self._project_root_str, self._env_scratch)
+        if not shell.lock.acquire(blocking=False):
+            return None
+        return shell
+    
+    def _hook_env(self, context: HookContext) -> Dict[str, str]:
+        """Return the command hook environment, updating only variables that changed."""
+        key = (
+            context.tool_name,
+            context.tool_input_json,
+            context.tool_output,
+            context.session_id,
+            context.agent_name,
+            context.plugin_root,
+            context.project_root_str or self._project_root_str,
+        )
+        env = self._env_scratch
+        if env is None:
+            env = self._env_scratch = os.environ.copy()
+        
+        # Hooks of one execute() share a context, so this is usually a no-op
+        if key != self._env_values:
+            for name, old, new in zip(_ENV_VARS, self._env_values, key):
+                if old != new:
+                    env[name] = new
+            self._env_values = key
+        return env
+    
     def _execute_prompt_hook(self, hook: HookConfig, context: HookContext) -> HookResult:
         """Execute a prompt-type hook."""
         if not hook.prompt or not self.prompt_executor:
             return HookResult.ERROR
         
         try:
-            prompt = self._substitute_variables(hook.prompt, context)
+            prompt = hook.prompt
+            if hook._prompt_fmt is not None:
+                prompt = hook._prompt_fmt.format_map(_HookVariables(context, self._project_root_str))
             result = self.prompt_executor(prompt, context)
             
             # Check result for block signal
-            if result and "BLOCK" in result.upper():
+            if result and _BLOCK_RE.search(result):
                 return HookResult.BLOCK
             return HookResult.CONTINUE
             
@@ -254,7 +753,7 @@ class HookEngine:
             result = self.agent_executor(hook.agent, context)
             
             # Check result for block signal
-            if result and "BLOCK" in result.upper():
+            if result and _BLOCK_RE.search(result):
                 return HookResult.BLOCK
             return HookResult.CONTINUE
             
@@ -264,22 +763,12 @@ class HookEngine:
     
     def _substitute_variables(self, template: str, context: HookContext) -> str:
         """Substitute context variables in a template string."""
-        result = template
-        result = result.replace("${TOOL_NAME}", context.tool_name)
-        result = result.replace("$TOOL_NAME", context.tool_name)
-        result = result.replace("${TOOL_INPUT}", json.dumps(context.tool_input))
-        result = result.replace("$TOOL_INPUT", json.dumps(context.tool_input))
-        result = result.replace("${TOOL_OUTPUT}", context.tool_output)
-        result = result.replace("$TOOL_OUTPUT", context.tool_output)
-        result = result.replace("${SESSION_ID}", context.session_id)
-        result = result.replace("$SESSION_ID", context.session_id)
-        result = result.replace("${AGENT_NAME}", context.agent_name)
-        result = result.replace("$AGENT_NAME", context.agent_name)
-        result = result.replace("${CLAUDE_PLUGIN_ROOT}", context.plugin_root)
-        result = result.replace("$CLAUDE_PLUGIN_ROOT", context.plugin_root)
-        result = result.replace("${PROJECT_ROOT}", str(context.project_root or self.project_root))
-        result = result.replace("$PROJECT_ROOT", str(context.project_root or self.project_root))
-        return result
+        if "$" not in template:
+            return template
+        fmt = _format_template(template)
+        if fmt is None:
+            return template
+        return fmt.format_map(_HookVariables(context, self._project_root_str))
 
 
 def main():
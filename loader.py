@@ -15,23 +15,51 @@ Updated for Claude Code v2.1.x compatibility:
 """
 
 import os
+import sys
+import copy
 import json
+import hashlib
 try:
     from .system_prompt import SystemPromptManager
 except ImportError:
     from system_prompt import SystemPromptManager
-import re
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml; use the pure-Python loader
+    from yaml import SafeLoader as _YamlLoader
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
 from pathlib import Path
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any, Union
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Any, Tuple, Union
+
+# Components are created per file and kept for the session; use __slots__
+# where dataclasses support it (Python 3.10+)
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 # Standard Claude Code locations
 CLAUDE_USER_DIR = Path.home() / ".claude"
 CLAUDE_PROJECT_DIR = Path(".claude")
 
+# Upper bound on component files read and parsed concurrently
+MAX_PARSE_WORKERS = min(32, (os.cpu_count() or 1) * 4)
 
-@dataclass
+# Parsed frontmatter/body of component files, one cache file per project
+# root, keyed by path and validated by mtime and size, so warm loads skip
+# reading and YAML parsing
+REGISTRY_CACHE_DIR = Path.home() / ".cache" / "cc2oc-bridge"
+
+# Bump when parsing changes, so caches written by older code are discarded
+REGISTRY_CACHE_VERSION = 1
+
+
+@dataclass(**_SLOTS)
 class Command:
     """Represents a Claude Code slash command."""
     name: str
@@ -51,7 +79,7 @@ class Command:
     agent: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Subagent:
     """Represents a Claude Code subagent."""
     name: str
@@ -67,7 +95,7 @@ class Subagent:
     scope: str = "project"
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Skill:
     """Represents a Claude Code skill."""
     name: str
@@ -78,12 +106,12 @@ class Skill:
     user_invocable: bool = True
     hooks: Dict[str, Any] = field(default_factory=dict)
     content: str = ""
-    supporting_files: List[Path] = field(default_factory=list)
+    supporting_files: List[str] = field(default_factory=list)  # paths, as str
     # v2.1.x: agent field for skill execution
     agent: Optional[str] = None
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Hook:
     """Represents a single hook configuration."""
     type: str  # "command", "prompt", or "agent"
@@ -95,7 +123,7 @@ class Hook:
     timeout: int = 600  # 10 minutes (v2.1.x update)
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Plugin:
     """Represents a Claude Code plugin."""
     name: str
@@ -119,19 +147,180 @@ class BridgeRegistry:
     hooks: Dict[str, List[Dict]] = field(default_factory=dict)
     # Track executed once-hooks
     executed_once_hooks: set = field(default_factory=set)
+    
+    def __post_init__(self):
+        self.index_names()
+    
+    def index_names(self):
+        """
+        Snapshot component names as tuples so listings and "not found"
+        replies reuse them instead of building a new list per call.
+        Call again after adding components.
+        """
+        self.command_names: Tuple[str, ...] = tuple(self.commands)
+        self.subagent_names: Tuple[str, ...] = tuple(self.subagents)
+        self.skill_names: Tuple[str, ...] = tuple(self.skills)
+        self.plugin_names: Tuple[str, ...] = tuple(self.plugins)
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Convert the non-native types found in the registry for orjson."""
+    if isinstance(obj, Path):
+        return str(obj)
+    if isinstance(obj, set):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps_json_bytes(obj: Any) -> bytes:
+    """Serialize to indented UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode("utf-8")
+
+
+def dumps_json(obj: Any) -> str:
+    """Serialize to indented JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode("utf-8")
+    return json.dumps(obj, indent=2)
+
+
+def _frontmatter_span(content: str) -> Optional[Tuple[int, int, int]]:
+    """
+    Locate frontmatter with plain string scans.
+    
+    Returns (yaml_start, yaml_end, body_start) exactly where the regex
+    ^---\\s*\\n(.*?)\\n---\\s*\\n(.*) (DOTALL) would put its groups, or None
+    when it would not match.
+    """
+    if not content.startswith("---"):
+        return None
+    n = len(content)
+    
+    # "---" then whitespace ending in a newline; the YAML starts after one
+    # of those newlines (the last one, unless only an earlier one works)
+    j = 3
+    while j < n and content[j].isspace():
+        j += 1
+    newline = content.rfind("\n", 3, j)
+    while newline != -1:
+        start = newline + 1
+        # Closing "\n---" must also be followed by whitespace ending in a
+        # newline; the body starts after the last newline of that run
+        end = content.find("\n---", start)
+        while end != -1:
+            k = m = end + 4
+            while m < n and content[m].isspace():
+                m += 1
+            last = content.rfind("\n", k, m)
+            if last != -1:
+                return start, end, last + 1
+            end = content.find("\n---", end + 1)
+        newline = content.rfind("\n", 3, newline)
+    return None
+
+
+def read_json(path: Union[str, Path]) -> Any:
+    """Read and parse a JSON file from its raw bytes, using orjson when it is installed."""
+    data = _read_bytes(path)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 def parse_frontmatter(content: str) -> tuple[Dict[str, Any], str]:
     """Extract YAML frontmatter and body from markdown content."""
-    match = re.match(r'^---\s*\n(.*?)\n---\s*\n(.*)', content, re.DOTALL)
-    if match:
+    span = _frontmatter_span(content)
+    if span is None:
+        return {}, content
+    start, end, body_start = span
+    try:
+        frontmatter = yaml.load(content[start:end], Loader=_YamlLoader) or {}
+        return frontmatter, content[body_start:]
+    except yaml.YAMLError:
+        return {}, content
+
+
+def _read_bytes(path: Union[str, Path]) -> bytes:
+    """Read a whole file with a single os.read sized from fstat."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        size = os.fstat(fd).st_size
+        data = os.read(fd, size + 1)
+        if len(data) > size:
+            # The file grew since fstat; read the remainder
+            chunks = [data]
+            while chunks[-1]:
+                chunks.append(os.read(fd, 65536))
+            data = b"".join(chunks)
+    finally:
+        os.close(fd)
+    return data
+
+
+def _slurp(path: str) -> str:
+    """
+    Read a UTF-8 text file without the TextIOWrapper layer. Newlines are
+    normalised the way text-mode reads do.
+    """
+    text = _read_bytes(path).decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def _prefetch(paths: List[str]):
+    """Ask the kernel to start reading files ahead of use (POSIX_FADV_WILLNEED)."""
+    for path in paths:
         try:
-            frontmatter = yaml.safe_load(match.group(1)) or {}
-            body = match.group(2)
-            return frontmatter, body
-        except yaml.YAMLError:
-            return {}, content
-    return {}, content
+            fd = os.open(path, os.O_RDONLY)
+        except OSError:
+            continue
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_WILLNEED)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
+
+
+def _list_names(directory: Path) -> Optional[set]:
+    """Names of a directory's entries, or None if it cannot be listed."""
+    try:
+        with os.scandir(directory) as it:
+            return {entry.name for entry in it}
+    except OSError:
+        return None
+
+
+def _scandir_md(root: str, namespace: str = ""):
+    """
+    Yield (DirEntry, namespace) for every *.md file under root.
+    
+    Each directory's files come before its subdirectories, matching
+    Path.rglob order; symlinked directories are not descended into.
+    """
+    subdirs = []
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry)
+                elif entry.name.endswith(".md") and entry.is_file():
+                    yield entry, namespace
+    except OSError:
+        return
+    for entry in subdirs:
+        yield from _scandir_md(entry.path, os.path.join(namespace, entry.name) if namespace else entry.name)
+
+
+def _intern(value: Any) -> Any:
+    """
+    Intern small enumerated frontmatter values (model, context, ...) so the
+    many components sharing one compare by identity; non-strings pass through.
+    """
+    return sys.intern(value) if type(value) is str else value
 
 
 def parse_allowed_tools(tools_value: Union[str, List, None]) -> List[str]:
@@ -144,15 +333,16 @@ def parse_allowed_tools(tools_value: Union[str, List, None]) -> List[str]:
     if tools_value is None:
         return []
     if isinstance(tools_value, str):
-        return [t.strip() for t in tools_value.split(",") if t.strip()]
+        # Strip each piece once; tool names are a small closed set, so intern them
+        return list(map(sys.intern, filter(None, map(str.strip, tools_value.split(",")))))
     elif isinstance(tools_value, list):
         # Handle nested lists (YAML multiline)
         result = []
         for item in tools_value:
             if isinstance(item, str):
-                result.append(item.strip())
+                result.append(sys.intern(item.strip()))
             elif isinstance(item, list):
-                result.extend([str(i).strip() for i in item])
+                result.extend([sys.intern(str(i).strip()) for i in item])
         return result
     return []
 
@@ -189,6 +379,14 @@ class BridgeLoader:
     def __init__(self, project_root: Path = None):
         self.project_root = Path(project_root) if project_root else Path.cwd()
         self.registry = BridgeRegistry()
+        # path -> [mtime_ns, size, frontmatter, body]
+        self._parse_cache: Optional[Dict[str, list]] = None
+        self._parse_cache_dirty = False
+        # Cache keys used by this load; the rest are dropped on save
+        self._parse_cache_seen: set = set()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        # Kept across calls; it caches the prompt until a source file changes
+        self._system_prompt_manager: Optional[SystemPromptManager] = None
     
     def load_all(self) -> BridgeRegistry:
         """Load all Claude Code components."""
@@ -197,33 +395,170 @@ class BridgeLoader:
         # self._load_subagents(CLAUDE_USER_DIR / "agents", scope="user")
         # self._load_skills(CLAUDE_USER_DIR / "skills", scope="user")
         
-        # Load from project directory
-        project_claude = self.project_root / ".claude"
-        self._load_commands(project_claude / "commands", scope="project")
-        self._load_subagents(project_claude / "agents", scope="project")
-        self._load_skills(project_claude / "skills", scope="project")
-        
-        # Load plugins
-        self._load_plugins()
+        try:
+            # Load from project directory
+            project_claude = self.project_root / ".claude"
+            present = _list_names(project_claude) or set()
+            if "commands" in present:
+                self._load_commands(project_claude / "commands", scope="project")
+            if "agents" in present:
+                self._load_subagents(project_claude / "agents", scope="project")
+            if "skills" in present:
+                self._load_skills(project_claude / "skills", scope="project")
+            
+            # Load plugins
+            self._load_plugins()
+        finally:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
         
+        self._save_registry_cache()
+        self.registry.index_names()
         return self.registry
     
+    def _registry_cache_file(self) -> Path:
+        """This project's parse cache file."""
+        root = os.path.abspath(self.project_root)
+        digest = hashlib.sha1(root.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        return REGISTRY_CACHE_DIR / f"registry-{digest}.json"
+    
+    def _load_registry_cache(self) -> Dict[str, list]:
+        """
+        Read this project's parse cache, starting empty if it is missing,
+        unreadable, or written by another cache version or project root.
+        """
+        try:
+            cache = read_json(self._registry_cache_file())
+        except (OSError, ValueError):
+            return {}
+        if (
+            not isinstance(cache, dict)
+            or cache.get("version") != REGISTRY_CACHE_VERSION
+            or cache.get("project_root") != os.path.abspath(self.project_root)
+            or not isinstance(cache.get("entries"), dict)
+        ):
+            return {}
+        return cache["entries"]
+    
+    def _save_registry_cache(self):
+        """
+        Write the parse cache back if this load added, refreshed or dropped
+        entries. Entries for files this load did not parse are dropped.
+        """
+        cache_file = self._registry_cache_file()
+        if self._parse_cache is None:
+            # Nothing was parsed, so nothing in an old cache is current
+            try:
+                cache_file.unlink()
+            except OSError:
+                pass
+            return
+        
+        seen = self._parse_cache_seen
+        stale = [key for key in self._parse_cache if key not in seen]
+        for key in stale:
+            del self._parse_cache[key]
+        if not (self._parse_cache_dirty or stale):
+            return
+        
+        cache = {
+            "version": REGISTRY_CACHE_VERSION,
+            "project_root": os.path.abspath(self.project_root),
+            "entries": self._parse_cache,
+        }
+        try:
+            if orjson is not None:
+                data = orjson.dumps(cache)
+            else:
+                data = json.dumps(cache, separators=(",", ":")).encode("utf-8")
+            cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, cache_file)
+            self._parse_cache_dirty = False
+        except (OSError, TypeError):
+            pass
+    
+    def _parse_files(self, paths: List[Path]) -> List[Union[Tuple[Dict[str, Any], str], Exception]]:
+        """
+        Parse component files in order, overlapping their reads on a thread
+        pool. A file that fails yields its exception instead of a result.
+        """
+        if self._parse_cache is None:
+            self._parse_cache = self._load_registry_cache()
+        
+        def parse(path: Path):
+            try:
+                return self._parse_file(path)
+            except Exception as e:
+                return e
+        
+        if len(paths) < 2:
+            return [parse(path) for path in paths]
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=MAX_PARSE_WORKERS)
+        if len(paths) > MAX_PARSE_WORKERS and hasattr(os, "posix_fadvise"):
+            # Files past the first batch of workers would wait for a free
+            # thread; have the kernel fetch the uncached ones meanwhile
+            uncached = [str(p) for p in paths[MAX_PARSE_WORKERS:] if str(p) not in self._parse_cache]
+            if uncached:
+                self._pool.submit(_prefetch, uncached)
+        return list(self._pool.map(parse, paths))
+    
+    def _parse_file(self, path: Path) -> Tuple[Dict[str, Any], str]:
+        """Frontmatter and body of a component file, from the parse cache when it is current."""
+        if self._parse_cache is None:
+            self._parse_cache = self._load_registry_cache()
+        
+        key = str(path)
+        st = os.stat(key)
+        self._parse_cache_seen.add(key)
+        cached = self._parse_cache.get(key)
+        if cached is not None and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+            # Components keep (and may mutate) what they are given, so
+            # hand out a copy rather than the cached dicts
+            return copy.deepcopy(cached[2]), cached[3]
+        
+        content = _slurp(key)
+        if not content.startswith("---"):
+            # No frontmatter: skip the scan, YAML and the round-trip check
+            self._parse_cache[key] = [st.st_mtime_ns, st.st_size, {}, content]
+            self._parse_cache_dirty = True
+            return {}, content
+        frontmatter, body = parse_frontmatter(content)
+        try:
+            # Only cache frontmatter that survives a JSON round trip
+            # unchanged (no dates, non-string keys, ...); the round-tripped
+            # copy is what gets cached, so it shares nothing with the result
+            cached_frontmatter = json.loads(json.dumps(frontmatter))
+            if cached_frontmatter != frontmatter:
+                return frontmatter, body
+        except (TypeError, ValueError):
+            return frontmatter, body
+        self._parse_cache[key] = [st.st_mtime_ns, st.st_size, cached_frontmatter, body]
+        self._parse_cache_dirty = True
+        return frontmatter, body
+    
     def _load_commands(self, commands_dir: Path, scope: str = "project"):
         """Load slash commands from a directory."""
-        if not commands_dir.exists():
-            return
+        entries = list(_scandir_md(str(commands_dir)))
+        cmd_files = [Path(entry.path) for entry, _ in entries]
+        # Bind the per-file lookups once for the loop
+        commands = self.registry.commands
+        parse_tools = parse_allowed_tools
+        parse_hooks = parse_hooks_from_frontmatter
         
-        for cmd_file in commands_dir.rglob("*.md"):
+        for (entry, namespace), cmd_file, result in zip(entries, cmd_files, self._parse_files(cmd_files)):
             try:
-                content = cmd_file.read_text(encoding="utf-8")
-                frontmatter, body = parse_frontmatter(content)
+                if isinstance(result, Exception):
+                    raise result
+                frontmatter, body = result
+                get = frontmatter.get
                 
-                # Determine namespace from subdirectory
-                rel_path = cmd_file.relative_to(commands_dir)
-                namespace = str(rel_path.parent) if rel_path.parent != Path(".") else ""
-                
-                # Command name is filename without extension
-                name = cmd_file.stem
+                # Command name is filename without extension; namespace
+                # is its subdirectory path
+                name = entry.name[:-3]
                 if namespace:
                     display_name = f"{namespace}:{name}"
                 else:
@@ -232,97 +567,124 @@ class BridgeLoader:
                 cmd = Command(
                     name=display_name,
                     path=cmd_file,
-                    description=frontmatter.get("description", ""),
-                    argument_hint=frontmatter.get("argument-hint", ""),
-                    allowed_tools=parse_allowed_tools(frontmatter.get("allowed-tools")),
-                    disallowed_tools=parse_allowed_tools(frontmatter.get("disallowedTools")),
-                    model=frontmatter.get("model"),
-                    hooks=parse_hooks_from_frontmatter(frontmatter.get("hooks")),
+                    description=get("description", ""),
+                    argument_hint=get("argument-hint", ""),
+                    allowed_tools=parse_tools(get("allowed-tools")),
+                    disallowed_tools=parse_tools(get("disallowedTools")),
+                    model=_intern(get("model")),
+                    hooks=parse_hooks(get("hooks")),
                     content=body,
                     scope=scope,
                     namespace=namespace,
                     # v2.1.x fields
-                    context=frontmatter.get("context", "main"),
-                    agent=frontmatter.get("agent")
+                    context=_intern(get("context", "main")),
+                    agent=get("agent")
                 )
                 
-                self.registry.commands[display_name] = cmd
+                commands[sys.intern(display_name)] = cmd
                 
             except Exception as e:
                 print(f"Warning: Failed to load command {cmd_file}: {e}")
     
     def _load_subagents(self, agents_dir: Path, scope: str = "project"):
         """Load subagents from a directory."""
-        if not agents_dir.exists():
+        try:
+            with os.scandir(agents_dir) as it:
+                agent_files = [Path(e.path) for e in it if e.name.endswith(".md") and e.is_file()]
+        except OSError:
             return
         
-        for agent_file in agents_dir.glob("*.md"):
+        subagents = self.registry.subagents
+        parse_tools = parse_allowed_tools
+        parse_hooks = parse_hooks_from_frontmatter
+        
+        for agent_file, result in zip(agent_files, self._parse_files(agent_files)):
             try:
-                content = agent_file.read_text(encoding="utf-8")
-                frontmatter, body = parse_frontmatter(content)
+                if isinstance(result, Exception):
+                    raise result
+                frontmatter, body = result
+                get = frontmatter.get
                 
-                name = frontmatter.get("name", agent_file.stem)
+                name = sys.intern(str(get("name", agent_file.stem)))
                 
                 agent = Subagent(
                     name=name,
                     path=agent_file,
-                    description=frontmatter.get("description", ""),
-                    tools=parse_allowed_tools(frontmatter.get("tools")),
-                    disallowed_tools=parse_allowed_tools(frontmatter.get("disallowedTools")),
-                    model=frontmatter.get("model", "sonnet"),
-                    permission_mode=frontmatter.get("permissionMode", "default"),
+                    description=get("description", ""),
+                    tools=parse_tools(get("tools")),
+                    disallowed_tools=parse_tools(get("disallowedTools")),
+                    model=_intern(get("model", "sonnet")),
+                    permission_mode=_intern(get("permissionMode", "default")),
                     # v2.1.x: hooks in agent frontmatter
-                    hooks=parse_hooks_from_frontmatter(frontmatter.get("hooks")),
-                    skills=frontmatter.get("skills", []),
+                    hooks=parse_hooks(get("hooks")),
+                    skills=get("skills", []),
                     prompt=body,
                     scope=scope
                 )
                 
-                self.registry.subagents[name] = agent
+                subagents[name] = agent
                 
             except Exception as e:
                 print(f"Warning: Failed to load subagent {agent_file}: {e}")
     
     def _load_skills(self, skills_dir: Path, scope: str = "project"):
         """Load skills from a directory."""
-        if not skills_dir.exists():
+        try:
+            with os.scandir(skills_dir) as it:
+                skill_dirs = [Path(e.path) for e in it if e.is_dir()]
+        except OSError:
             return
         
         # Skills are in subdirectories with SKILL.md
-        for skill_dir in skills_dir.iterdir():
-            if not skill_dir.is_dir():
-                continue
-            
-            skill_file = skill_dir / "SKILL.md"
-            if not skill_file.exists():
+        found = []
+        for skill_dir in skill_dirs:
+            # One listing finds SKILL.md and the supporting files
+            has_skill_file = False
+            supporting = []
+            try:
+                with os.scandir(skill_dir) as it:
+                    for entry in it:
+                        if not entry.is_file():
+                            continue
+                        if entry.name == "SKILL.md":
+                            has_skill_file = True
+                        else:
+                            supporting.append(entry.path)
+            except OSError:
                 continue
-            
+            if has_skill_file:
+                found.append((skill_dir, supporting))
+        
+        skill_files = [skill_dir / "SKILL.md" for skill_dir, _ in found]
+        skills = self.registry.skills
+        parse_tools = parse_allowed_tools
+        parse_hooks = parse_hooks_from_frontmatter
+        
+        for (skill_dir, supporting), skill_file, result in zip(found, skill_files, self._parse_files(skill_files)):
             try:
-                content = skill_file.read_text(encoding="utf-8")
-                frontmatter, body = parse_frontmatter(content)
+                if isinstance(result, Exception):
+                    raise result
+                frontmatter, body = result
+                get = frontmatter.get
                 
-                name = frontmatter.get("name", skill_dir.name)
-                
-                # Find supporting files
-                supporting = [f for f in skill_dir.iterdir() 
-                             if f.is_file() and f.name != "SKILL.md"]
+                name = sys.intern(str(get("name", skill_dir.name)))
                 
                 skill = Skill(
                     name=name,
                     path=skill_file,
-                    description=frontmatter.get("description", ""),
-                    allowed_tools=parse_allowed_tools(frontmatter.get("allowed-tools")),
-                    context_mode=frontmatter.get("context", "main"),
-                    user_invocable=frontmatter.get("user-invocable", True),
+                    description=get("description", ""),
+                    allowed_tools=parse_tools(get("allowed-tools")),
+                    context_mode=_intern(get("context", "main")),
+                    user_invocable=get("user-invocable", True),
                     # v2.1.x: hooks in skill frontmatter
-                    hooks=parse_hooks_from_frontmatter(frontmatter.get("hooks")),
+                    hooks=parse_hooks(get("hooks")),
                     content=body,
                     supporting_files=supporting,
                     # v2.1.x: agent field
-                    agent=frontmatter.get("agent")
+                    agent=get("agent")
                 )
                 
-                self.registry.skills[name] = skill
+                skills[name] = skill
                 
             except Exception as e:
                 print(f"Warning: Failed to load skill {skill_dir}: {e}")
@@ -337,11 +699,7 @@ class BridgeLoader:
         #             self._load_plugin(plugin_dir)
         
         # Check project plugins
-        project_plugins = self.project_root / ".claude-plugins"
-        if project_plugins.exists():
-            for plugin_dir in project_plugins.iterdir():
-                if plugin_dir.is_dir():
-                    self._load_plugin(plugin_dir)
+        self._load_plugin_dirs(self.project_root / ".claude-plugins")
         
         # Check for .claude-plugin in current directory (local plugin)
         local_plugin = self.project_root / ".claude-plugin"
@@ -349,72 +707,96 @@ class BridgeLoader:
             self._load_plugin(self.project_root)
         
         # Check cc2oc-bridge plugins directory
-        bridge_plugins = Path(__file__).parent / "plugins"
-        if bridge_plugins.exists():
-            for plugin_dir in bridge_plugins.iterdir():
-                if plugin_dir.is_dir():
-                    self._load_plugin(plugin_dir)
+        self._load_plugin_dirs(Path(__file__).parent / "plugins")
+    
+    def _load_plugin_dirs(self, plugins_dir: Path):
+        """Load every plugin directory directly under plugins_dir."""
+        try:
+            with os.scandir(plugins_dir) as it:
+                plugin_dirs = [Path(e.path) for e in it if e.is_dir()]
+        except OSError:
+            return
+        for plugin_dir in plugin_dirs:
+            self._load_plugin(plugin_dir)
     
     def _load_plugin(self, plugin_dir: Path):
         """Load a single plugin from its directory."""
+        # One listing of the plugin root (and of .claude, if present)
+        # answers every "does X exist" question below
+        top = _list_names(plugin_dir)
+        if top is None:
+            return
+        claude = (_list_names(plugin_dir / ".claude") if ".claude" in top else None) or set()
+        
+        def present(rel: str) -> bool:
+            """Check a path relative to plugin_dir, using the listing when it is a direct child."""
+            if "/" in rel or os.sep in rel:
+                return (plugin_dir / rel).exists()
+            return rel in top
+        
+        loaded = set()
+        
+        def load_once(load, directory: Path):
+            """Run a component loader on directory unless it already ran on the same real path."""
+            key = (load.__name__, os.path.realpath(directory))
+            if key not in loaded:
+                loaded.add(key)
+                load(directory, scope="plugin")
+        
         manifest_file = plugin_dir / ".claude-plugin" / "plugin.json"
-        if not manifest_file.exists():
+        if ".claude-plugin" not in top or not manifest_file.exists():
             manifest_file = plugin_dir / "plugin.json"
-        
-        if not manifest_file.exists():
-            return
+            if "plugin.json" not in top:
+                return
         
         try:
-            manifest = json.loads(manifest_file.read_text(encoding="utf-8"))
+            manifest = read_json(manifest_file)
             
             plugin = Plugin(
-                name=manifest.get("name", plugin_dir.name),
+                name=sys.intern(str(manifest.get("name", plugin_dir.name))),
                 path=plugin_dir,
                 version=manifest.get("version", "1.0.0"),
                 description=manifest.get("description", "")
             )
             
             # Load plugin commands
-            commands_dir = plugin_dir / manifest.get("commands", "commands")
-            if commands_dir.exists():
-                self._load_commands(commands_dir, scope="plugin")
+            commands_rel = manifest.get("commands", "commands")
+            if present(commands_rel):
+                load_once(self._load_commands, plugin_dir / commands_rel)
             
             # Also check .claude/commands structure
-            claude_commands = plugin_dir / ".claude" / "commands"
-            if claude_commands.exists():
-                self._load_commands(claude_commands, scope="plugin")
+            if "commands" in claude:
+                load_once(self._load_commands, plugin_dir / ".claude" / "commands")
             
             # Load plugin agents
-            agents_dir = plugin_dir / manifest.get("agents", "agents")
-            if agents_dir.exists():
-                self._load_subagents(agents_dir, scope="plugin")
+            agents_rel = manifest.get("agents", "agents")
+            if present(agents_rel):
+                load_once(self._load_subagents, plugin_dir / agents_rel)
             
             # Also check .claude/agents structure
-            claude_agents = plugin_dir / ".claude" / "agents"
-            if claude_agents.exists():
-                self._load_subagents(claude_agents, scope="plugin")
+            if "agents" in claude:
+                load_once(self._load_subagents, plugin_dir / ".claude" / "agents")
             
             # Load plugin skills
-            skills_dir = plugin_dir / manifest.get("skills", "skills")
-            if skills_dir.exists():
-                self._load_skills(skills_dir, scope="plugin")
+            skills_rel = manifest.get("skills", "skills")
+            if present(skills_rel):
+                load_once(self._load_skills, plugin_dir / skills_rel)
             
             # Also check .claude/skills structure
-            claude_skills = plugin_dir / ".claude" / "skills"
-            if claude_skills.exists():
-                self._load_skills(claude_skills, scope="plugin")
+            if "skills" in claude:
+                load_once(self._load_skills, plugin_dir / ".claude" / "skills")
             
             # Load plugin hooks
             hooks_file = plugin_dir / "hooks" / "hooks.json"
-            if hooks_file.exists():
-                hooks_data = json.loads(hooks_file.read_text(encoding="utf-8"))
+            if "hooks" in top and hooks_file.exists():
+                hooks_data = read_json(hooks_file)
                 plugin.hooks = hooks_data.get("hooks", {})
                 self._merge_hooks(plugin.hooks)
             
             # Load MCP config
-            mcp_file = plugin_dir / ".mcp.json"
-            if mcp_file.exists():
-                plugin.mcp_config = json.loads(mcp_file.read_text(encoding="utf-8"))
+            if ".mcp.json" in top:
+                mcp_file = plugin_dir / ".mcp.json"
+                plugin.mcp_config = read_json(mcp_file)
             
             self.registry.plugins[plugin.name] = plugin
             
@@ -423,32 +805,55 @@ class BridgeLoader:
     
     def _merge_hooks(self, hooks: Dict[str, Any]):
         """Merge hooks into the registry."""
+        merged = self.registry.hooks
         for hook_type, hook_list in hooks.items():
-            if hook_type not in self.registry.hooks:
-                self.registry.hooks[hook_type] = []
+            target = merged.setdefault(hook_type, [])
             if isinstance(hook_list, list):
-                self.registry.hooks[hook_type].extend(hook_list)
+                target.extend(hook_list)
     
     def get_system_prompt(self) -> str:
         """Get unified system prompt from CLAUDE.md files."""
-        return SystemPromptManager(self.project_root).get_system_prompt()
+        if self._system_prompt_manager is None:
+            self._system_prompt_manager = SystemPromptManager(self.project_root)
+        return self._system_prompt_manager.get_system_prompt()
 
-    def to_json(self) -> str:
-        """Export registry to JSON for inspection."""
+    def _serialize_registry(self) -> Dict[str, Any]:
+        """Convert the registry to JSON-compatible builtins."""
         def serialize(obj):
             if isinstance(obj, Path):
                 return str(obj)
             elif isinstance(obj, set):
                 return list(obj)
             elif hasattr(obj, '__dataclass_fields__'):
-                return {k: serialize(v) for k, v in obj.__dict__.items()}
+                return {f.name: serialize(getattr(obj, f.name)) for f in fields(obj)}
             elif isinstance(obj, dict):
                 return {k: serialize(v) for k, v in obj.items()}
             elif isinstance(obj, list):
                 return [serialize(i) for i in obj]
             return obj
         
-        return json.dumps(serialize(self.registry), indent=2)
+        return serialize(self.registry)
+    
+    def _registry_bytes_orjson(self) -> bytes:
+        """
+        Serialize the registry with orjson, which walks the component
+        dataclasses natively. Only the registry's declared fields are
+        passed, leaving out the name indexes kept alongside them.
+        """
+        registry = {f.name: getattr(self.registry, f.name) for f in fields(self.registry)}
+        return orjson.dumps(registry, default=_orjson_default, option=orjson.OPT_INDENT_2)
+    
+    def to_json(self) -> str:
+        """Export registry to JSON for inspection."""
+        if orjson is not None:
+            return self._registry_bytes_orjson().decode("utf-8")
+        return dumps_json(self._serialize_registry())
+    
+    def to_json_bytes(self) -> bytes:
+        """Export registry to UTF-8 JSON bytes, ready to write to a binary stream."""
+        if orjson is not None:
+            return self._registry_bytes_orjson()
+        return dumps_json_bytes(self._serialize_registry())
 
 
 def main():
@@ -503,6 +908,6 @@ if __name__ == "__main__":
 
 def load_system_prompt(self) -> str:
     """Load the bridged system prompt from CLAUDE.md files."""
-    from .system_prompt import SystemPromptManager
-    manager = SystemPromptManager(self.project_root)
-    return manager.get_system_prompt()
+    if isinstance(self, BridgeLoader):
+        return self.get_system_prompt()
+    return SystemPromptManager(self.project_root).get_system_prompt()
@@ -33,6 +33,19 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 
+try:
+    from .loader import read_json
+except ImportError:
+    from loader import read_json
+
+
+def _command_array(server_config: Dict[str, Any]) -> Any:
+    """Build the OpenCode command array: a string command is joined with its args."""
+    command = server_config.get("command", "")
+    if isinstance(command, str):
+        return [command] + server_config.get("args", [])
+    return command
+
 
 def convert_claude_to_opencode_mcp(claude_config: Dict[str, Any]) -> Dict[str, Any]:
     """
@@ -41,29 +54,17 @@ def convert_claude_to_opencode_mcp(claude_config: Dict[str, Any]) -> Dict[str, A
     Claude: {"mcpServers": {"name": {"command": "npx", "args": [...], "env": {...}}}}
     OpenCode: {"mcp": {"name": {"type": "local", "command": [...], "enabled": true, "environment": {...}}}}
     """
-    opencode_mcp = {}
-    
-    for server_name, server_config in claude_config.get("mcpServers", {}).items():
-        # Build command array
-        command = server_config.get("command", "")
-        args = server_config.get("args", [])
-        
-        if isinstance(command, str):
-            command_array = [command] + args
-        else:
-            command_array = command
-        
-        # Convert environment
-        environment = server_config.get("env", {})
-        
-        opencode_mcp[server_name] = {
-            "type": "local",
-            "command": command_array,
-            "enabled": True,
-            "environment": environment
+    return {
+        "mcp": {
+            server_name: {
+                "type": "local",
+                "command": _command_array(server_config),
+                "enabled": True,
+                "environment": server_config.get("env", {}),
+            }
+            for server_name, server_config in claude_config.get("mcpServers", {}).items()
         }
-    
-    return {"mcp": opencode_mcp}
+    }
 
 
 class MCPManager:
@@ -81,7 +82,7 @@ class MCPManager:
             return {}
         
         try:
-            claude_config = json.loads(mcp_file.read_text(encoding="utf-8"))
+            claude_config = read_json(mcp_file)
             opencode_config = convert_claude_to_opencode_mcp(claude_config)
             
             # Register servers
@@ -6,9 +6,38 @@ Provides emulation of Claude Code-specific tools that don't have
 direct OpenCode equivalents.
 """
 
+import os
+import re
 import sys
 import json
-from typing import List, Optional, Dict, Any
+from pathlib import Path
+from typing import List, Optional, Dict, Any, Tuple, Union
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+# JSON whitespace, for stepping between values of a notebook's cells array
+_JSON_WS = re.compile(r"[ \t\n\r]*")
+_JSON_DECODER = json.JSONDecoder()
+
+# Agent names TaskRunner handles without a registered subagent (lowercase)
+BUILTIN_AGENTS = frozenset({"explore", "plan", "general"})
+
+
+def _read_line(prompt: str) -> str:
+    """
+    input() for terminals, keeping line editing; piped stdin is read with
+    sys.stdin.readline directly. Raises EOFError at end of input.
+    """
+    if sys.stdin.isatty():
+        return input(prompt)
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    if not line:
+        raise EOFError
+    return line[:-1] if line.endswith("\n") else line
 
 
 class AskFollowupQuestion:
@@ -38,28 +67,24 @@ class AskFollowupQuestion:
         Returns:
             The selected option or user's freeform response
         """
-        print(f"\n{'='*50}")
-        print(f"  {header}")
-        print(f"{'='*50}")
-        print(f"\n{question}\n")
-        
-        for i, option in enumerate(options, start=1):
-            print(f"  [{i}] {option}")
-        
+        # Write the whole banner at once rather than a print() per line
+        separator = "=" * 50
+        lines = ["", separator, f"  {header}", separator, "", question, ""]
+        lines.extend(f"  [{i}] {option}" for i, option in enumerate(options, start=1))
         if allow_freeform:
-            print(f"  [0] Enter custom response")
-        
-        print()
+            lines.append("  [0] Enter custom response")
+        lines.append("")
+        sys.stdout.write("\n".join(lines) + "\n")
         
         while True:
             try:
-                choice = input("Your choice: ").strip()
+                choice = _read_line("Your choice: ").strip()
                 
                 # Check if it's a number
-                if choice.isdigit():
+                if choice.isdecimal():
                     choice_num = int(choice)
                     if choice_num == 0 and allow_freeform:
-                        return input("Enter your response: ").strip()
+                        return _read_line("Enter your response: ").strip()
                     elif 1 <= choice_num <= len(options):
                         return options[choice_num - 1]
                     else:
@@ -88,11 +113,10 @@ class AskFollowupQuestion:
         Format the question for agent consumption (non-interactive).
         Returns a formatted prompt that the agent can present.
         """
-        formatted = f"\n## {header}\n\n{question}\n\n**Options:**\n"
-        for i, option in enumerate(options, start=1):
-            formatted += f"{i}. {option}\n"
-        formatted += "\nPlease select an option by number or provide your own response."
-        return formatted
+        parts = [f"\n## {header}\n\n{question}\n\n**Options:**\n"]
+        parts.extend(f"{i}. {option}\n" for i, option in enumerate(options, start=1))
+        parts.append("\nPlease select an option by number or provide your own response.")
+        return "".join(parts)
 
 
 class SkillExecutor:
@@ -104,6 +128,17 @@ class SkillExecutor:
     
     def __init__(self, registry):
         self.registry = registry
+        self.index_names()
+    
+    def index_names(self):
+        """
+        Map every skill and command name to its kind and component so
+        execute() is a single lookup; skills shadow commands of the same
+        name. Call again after the registry changes.
+        """
+        index = {name: ("command", cmd) for name, cmd in self.registry.commands.items()}
+        index.update((name, ("skill", skill)) for name, skill in self.registry.skills.items())
+        self._index: Dict[str, Tuple[str, Any]] = index
     
     def execute(self, skill_name: str, arguments: str = "") -> Dict[str, Any]:
         """
@@ -116,9 +151,10 @@ class SkillExecutor:
         Returns:
             Dict with skill content and metadata
         """
-        # Check if it's a skill
-        if skill_name in self.registry.skills:
-            skill = self.registry.skills[skill_name]
+        kind, component = self._index.get(skill_name, (None, None))
+        
+        if kind == "skill":
+            skill = component
             return {
                 "type": "skill",
                 "name": skill.name,
@@ -128,9 +164,8 @@ class SkillExecutor:
                 "context_mode": skill.context_mode
             }
         
-        # Check if it's a command
-        if skill_name in self.registry.commands:
-            cmd = self.registry.commands[skill_name]
+        if kind == "command":
+            cmd = component
             return {
                 "type": "command",
                 "name": cmd.name,
@@ -144,6 +179,97 @@ class SkillExecutor:
         }
 
 
+def _loads(data: Union[str, bytes]) -> Any:
+    """Parse JSON with orjson when it is installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # e.g. NaN in outputs, which orjson rejects; let json decide
+            pass
+    return json.loads(data)
+
+
+def _cell_spans(text: str) -> Optional[List[Tuple[int, int]]]:
+    """
+    (start, end) offsets of each cell in a notebook's top-level "cells"
+    array, found by decoding one value at a time so that no cell outlives
+    the scan. Returns None when the document does not have that shape.
+    """
+    decode = _JSON_DECODER.raw_decode
+    ws = _JSON_WS.match
+    try:
+        i = ws(text, 0).end()
+        if text[i] != "{":
+            return None
+        i = ws(text, i + 1).end()
+        while text[i] != "}":
+            key, i = decode(text, i)
+            i = ws(text, i).end()
+            if text[i] != ":":
+                return None
+            i = ws(text, i + 1).end()
+            if key == "cells":
+                break
+            # Skip this value and the comma after it
+            _, i = decode(text, i)
+            i = ws(text, i).end()
+            if text[i] == ",":
+                i = ws(text, i + 1).end()
+            elif text[i] != "}":
+                return None
+        else:
+            return None
+        
+        if text[i] != "[":
+            return None
+        spans = []
+        i = ws(text, i + 1).end()
+        if text[i] == "]":
+            return spans
+        while True:
+            _, end = decode(text, i)
+            spans.append((i, end))
+            i = ws(text, end).end()
+            if text[i] == "]":
+                return spans
+            if text[i] != ",":
+                return None
+            i = ws(text, i + 1).end()
+    except (ValueError, IndexError):
+        return None
+
+
+def _dump_cell(cell: Dict[str, Any]) -> str:
+    """Serialize a cell the way json.dumps(notebook, indent=1) lays it out inside "cells"."""
+    # JSON strings cannot contain raw newlines, so every newline is layout
+    return json.dumps(cell, indent=1).replace("\n", "\n  ")
+
+
+def _write_atomic(path: Path, data: bytes):
+    """
+    Replace a file's contents via a synced sibling temp file and os.replace,
+    so a crash mid-write leaves the old file intact. Keeps the file's mode.
+    """
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        try:
+            os.chmod(tmp, os.stat(path).st_mode & 0o7777)
+        except OSError:
+            pass
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
 class NotebookEdit:
     """
     Emulates Claude Code's NotebookEdit tool for Jupyter notebooks.
@@ -171,26 +297,41 @@ class NotebookEdit:
         Returns:
             Result of the operation
         """
-        import json
-        from pathlib import Path
-        
         try:
             path = Path(notebook_path)
             if not path.exists():
                 return {"error": f"Notebook not found: {notebook_path}"}
             
-            notebook = json.loads(path.read_text(encoding="utf-8"))
+            text = path.read_bytes().decode("utf-8")
+            
+            # Rewrite just the target cell's text when the cells can be located
+            spans = _cell_spans(text)
+            if spans is not None:
+                if cell_index < 0 or cell_index >= len(spans):
+                    return {"error": f"Cell index {cell_index} out of range (0-{len(spans)-1})"}
+                start, end = spans[cell_index]
+                cell = _loads(text[start:end])
+                # nbformat accepts source as one string as well as a list of lines
+                cell["source"] = new_content
+                cell["cell_type"] = cell_type
+                _write_atomic(path, (text[:start] + _dump_cell(cell) + text[end:]).encode("utf-8"))
+                return {
+                    "success": True,
+                    "message": f"Updated cell {cell_index} in {notebook_path}"
+                }
+            
+            notebook = _loads(text)
             
             cells = notebook.get("cells", [])
             if cell_index < 0 or cell_index >= len(cells):
                 return {"error": f"Cell index {cell_index} out of range (0-{len(cells)-1})"}
             
             # Update the cell
-            cells[cell_index]["source"] = new_content.splitlines(keepends=True)
+            cells[cell_index]["source"] = new_content
             cells[cell_index]["cell_type"] = cell_type
             
             # Write back
-            path.write_text(json.dumps(notebook, indent=1), encoding="utf-8")
+            _write_atomic(path, json.dumps(notebook, indent=1).encode("utf-8"))
             
             return {
                 "success": True,
@@ -208,19 +349,16 @@ class NotebookEdit:
         position: int = -1
     ) -> Dict[str, Any]:
         """Add a new cell to a notebook."""
-        import json
-        from pathlib import Path
-        
         try:
             path = Path(notebook_path)
             if not path.exists():
                 return {"error": f"Notebook not found: {notebook_path}"}
             
-            notebook = json.loads(path.read_text(encoding="utf-8"))
+            text = path.read_bytes().decode("utf-8")
             
             new_cell = {
                 "cell_type": cell_type,
-                "source": content.splitlines(keepends=True),
+                "source": content,
                 "metadata": {},
             }
             
@@ -228,6 +366,23 @@ class NotebookEdit:
                 new_cell["outputs"] = []
                 new_cell["execution_count"] = None
             
+            # Splice the new cell's text next to an existing cell when the
+            # cells can be located, leaving the rest of the file untouched
+            spans = _cell_spans(text)
+            if spans:
+                if 0 <= position < len(spans):
+                    start = spans[position][0]
+                    text = text[:start] + _dump_cell(new_cell) + ",\n  " + text[start:]
+                else:
+                    end = spans[-1][1]
+                    text = text[:end] + ",\n  " + _dump_cell(new_cell) + text[end:]
+                _write_atomic(path, text.encode("utf-8"))
+                return {
+                    "success": True,
+                    "message": f"Added new {cell_type} cell to {notebook_path}"
+                }
+            
+            notebook = _loads(text)
             cells = notebook.get("cells", [])
             if position < 0:
                 cells.append(new_cell)
@@ -235,7 +390,7 @@ class NotebookEdit:
                 cells.insert(position, new_cell)
             
             notebook["cells"] = cells
-            path.write_text(json.dumps(notebook, indent=1), encoding="utf-8")
+            _write_atomic(path, json.dumps(notebook, indent=1).encode("utf-8"))
             
             return {
                 "success": True,
@@ -289,7 +444,7 @@ class TaskRunner:
             }
         
         # Built-in agents
-        if agent_name.lower() in ["explore", "plan", "general"]:
+        if agent_name.lower() in BUILTIN_AGENTS:
             return {
                 "type": "builtin",
                 "name": agent_name,
@@ -13,17 +13,72 @@ Behavior:
 5. Inserts into the conversation as a system message
 """
 
+from functools import lru_cache
 from pathlib import Path
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Tuple
+import json
 import os
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to stdlib json
+    orjson = None
+
+
+@lru_cache(maxsize=1)
+def _home() -> Path:
+    """Path.home(), resolved once per process."""
+    return Path.home()
+
 
 class SystemPromptManager:
     """Manages system prompts from CLAUDE.md files."""
     
+    # path -> (mtime_ns, size, stripped content), shared by all managers
+    _file_cache: Dict[str, Tuple[int, int, str]] = {}
+    
     def __init__(self, project_root: Path = None):
         self.project_root = project_root or Path.cwd()
-        self.home_dir = Path.home()
+        self.home_dir = _home()
+        self._sources = (
+            # 1. Global Instructions
+            ("GLOBAL INSTRUCTIONS", self.home_dir / ".claude" / "CLAUDE.md"),
+            # 2. Project Instructions
+            ("PROJECT INSTRUCTIONS", self.project_root / "CLAUDE.md"),
+            # 3. Project Context
+            ("PROJECT CONTEXT", self.project_root / ".claude" / "project-context.md"),
+        )
+        # (source stamps, prompt) from the last get_system_prompt()
+        self._prompt_cache: Optional[Tuple[tuple, str]] = None
+        # (source stamps, JSON) from the last get_opencode_instruction_bytes()
+        self._instruction_bytes: Optional[Tuple[tuple, bytes]] = None
+    
+    @classmethod
+    def _read_cached(cls, path: Path) -> Tuple[Optional[Tuple[int, int]], str]:
+        """
+        Stripped content of a source file and its (mtime_ns, size) stamp,
+        re-reading only when the stamp changed. Missing files give (None, "").
+        """
+        key = str(path)
+        try:
+            st = os.stat(key)
+        except OSError:
+            return None, ""
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = cls._file_cache.get(key)
+        if cached is not None and cached[:2] == stamp:
+            return stamp, cached[2]
+        
+        try:
+            content = path.read_text(encoding="utf-8").strip()
+        except FileNotFoundError:
+            return None, ""
+        cls._file_cache[key] = (stamp[0], stamp[1], content)
+        return stamp, content
         
+    def sources(self) -> Tuple[Tuple[str, Path], ...]:
+        """(section title, path) of each prompt source, in merge order."""
+        return self._sources
+    
     def get_system_prompt(self) -> str:
         """
         Construct the full system prompt from all sources.
@@ -32,34 +87,21 @@ class SystemPromptManager:
         1. ~/.claude/CLAUDE.md (Global instructions)
         2. ./CLAUDE.md (Project instructions)
         3. ./.claude/project-context.md (Project context/status)
-        """
-        sections = []
         
-        # 1. Global Instructions
-        global_claude = self.home_dir / ".claude" / "CLAUDE.md"
-        if global_claude.exists():
-            content = global_claude.read_text(encoding="utf-8").strip()
-            if content:
-                sections.append(f"## GLOBAL INSTRUCTIONS\n{content}")
-                
-        # 2. Project Instructions
-        project_claude = self.project_root / "CLAUDE.md"
-        if project_claude.exists():
-            content = project_claude.read_text(encoding="utf-8").strip()
-            if content:
-                sections.append(f"## PROJECT INSTRUCTIONS\n{content}")
+        Reuses the last prompt while none of the sources has changed.
+        """
+        sources = self.sources()
+        read = [self._read_cached(path) for _, path in sources]
+        stamps = tuple(stamp for stamp, _ in read)
         
-        # 3. Project Context
-        project_context = self.project_root / ".claude" / "project-context.md"
-        if project_context.exists():
-            content = project_context.read_text(encoding="utf-8").strip()
-            if content:
-                sections.append(f"## PROJECT CONTEXT\n{content}")
-                
-        if not sections:
-            return ""
-            
-        return "\n\n".join(sections)
+        if self._prompt_cache is None or self._prompt_cache[0] != stamps:
+            sections = [
+                f"## {title}\n{content}"
+                for (title, _), (_, content) in zip(sources, read)
+                if content
+            ]
+            self._prompt_cache = (stamps, "\n\n".join(sections))
+        return self._prompt_cache[1]
     
     def get_opencode_instruction_config(self) -> Dict[str, str]:
         """
@@ -73,6 +115,22 @@ class SystemPromptManager:
         return {
             "instructions": prompt
         }
+    
+    def get_opencode_instruction_bytes(self) -> bytes:
+        """
+        get_opencode_instruction_config() serialized as indented UTF-8 JSON,
+        reused while none of the prompt sources has changed.
+        """
+        self.get_system_prompt()
+        stamps, prompt = self._prompt_cache
+        if self._instruction_bytes is None or self._instruction_bytes[0] != stamps:
+            config = {"instructions": prompt} if prompt else {}
+            if orjson is not None:
+                data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+            else:
+                data = json.dumps(config, indent=2).encode("utf-8")
+            self._instruction_bytes = (stamps, data)
+        return self._instruction_bytes[1]
 
 
 def main():
@@ -84,12 +142,15 @@ def main():
         print("=== Loaded System Prompt ===")
         print(f"Length: {len(prompt)} chars")
         print("Sources detected:")
-        if (Path.home() / ".claude" / "CLAUDE.md").exists():
-            print("- Global (~/.claude/CLAUDE.md)")
-        if Path("CLAUDE.md").exists():
-            print("- Project (CLAUDE.md)")
-        if Path(".claude/project-context.md").exists():
-            print("- Context (.claude/project-context.md)")
+        # Answered from the read cache filled by get_system_prompt()
+        labels = (
+            "Global (~/.claude/CLAUDE.md)",
+            "Project (CLAUDE.md)",
+            "Context (.claude/project-context.md)",
+        )
+        for label, (_, path) in zip(labels, manager.sources()):
+            if str(path) in manager._file_cache:
+                print(f"- {label}")
         print("\nPreview:")
         print(prompt[:500] + "..." if len(prompt) > 500 else prompt)
     else: